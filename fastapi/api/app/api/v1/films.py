@@ -1,108 +1,192 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from ...core.dependencies import (
-    get_cache_service,
-    get_film_service,
-)
+from ...core.config import settings
+from ...core.dependencies import get_cache_service, get_film_service
 from ...core.security import ResilientCurrentUser
-from ...db.serializers.film import FilmDetailSerializer, FilmShortSerializer
-from ...services.cache import CacheService
+from ...db.serializers.film import (
+    FilmBatchRequest,
+    FilmDetailSerializer,
+    FilmFacetedPageSerializer,
+    FilmShortSerializer,
+    FilmWithPersonsSerializer,
+)
+from ...services.cache import CacheService, WithHeaders
+from ...services.codecs import loads
 from ...services.films import FilmService
-from ...utils.pagination import PageParams, get_pagination_params
+from ...utils.caching import cached_response, normalize_search_query
+from ...utils.pagination import (
+    CursorPageParams,
+    PageParams,
+    cursor_page,
+    decode_cursor,
+    get_cursor_pagination_params,
+    get_pagination_params,
+    page_content,
+)
 
 router = APIRouter(prefix="/films", tags=["Фильмы"])
 
 
+async def _all_films_facets(cache: CacheService, film_service: FilmService) -> dict[str, Any]:
+    """Facets of the unfiltered index, shared by every page and sort."""
+    body = await cache.get_or_set(
+        CacheService.build_key("films:facets", {}),
+        film_service.film_facets,
+        tags=("films",),
+        ttl=settings.cache_facets_ttl,
+    )
+    return loads(body)
+
+
 @router.get("/", 
-            response_model=list[FilmShortSerializer],
+            response_model=list[FilmShortSerializer] | FilmFacetedPageSerializer,
             summary="Список кинопроизведений",
-            description="Получение списка кинопроизведений",)
+            description="Получение списка кинопроизведений, с facets=true "
+                        "вместе с количеством фильмов по жанрам и рейтингу",)
+@cached_response("films:list", tags=("films",))
 async def films_list(
-    request: Request,
     _: ResilientCurrentUser,
-    params: PageParams = Depends(get_pagination_params),
+    params: CursorPageParams = Depends(get_cursor_pagination_params),
     sort: str | None = Query(None, description="Сортировка фильмов по рейтингу"),
-    genre: uuid.UUID | None = Query(None, description="Genre UUID для фильтра"),
+    genre: list[uuid.UUID] | None = Query(
+        None, description="UUID жанров для фильтра, можно передать несколько"
+    ),
+    genre_mode: Literal["any", "all"] = Query(
+        "any", description="any - хотя бы один из жанров, all - все жанры сразу"
+    ),
+    person: uuid.UUID | None = Query(None, description="UUID персоны для фильтра"),
+    role: Literal["actor", "writer", "director"] | None = Query(
+        None, description="Роль персоны из фильтра person"
+    ),
+    facets: bool = Query(False, description="Добавить количество фильмов по жанрам и рейтингу"),
     film_service: FilmService = Depends(get_film_service),
     cache: CacheService = Depends(get_cache_service),
-) -> list[dict[str, Any]]:
-    cache_key = cache.build_key(
-        "films:list",
-        {
-            "path": str(request.url.path),
-            "params": sorted(request.query_params.multi_items()),
-        },
-    )
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    items = await film_service.list_films(
+) -> WithHeaders:
+    if role is not None and person is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Параметр role задаётся только вместе с person",
+        )
+    filtered = bool(genre or person)
+    listing = film_service.list_films(
         page_size=params.page_size,
         page_number=params.page_number,
         sort=sort,
-        genre=str(genre) if genre else None,
+        genres=[str(genre_id) for genre_id in genre] if genre else None,
+        genre_mode=genre_mode,
+        person=str(person) if person else None,
+        role=role,
+        search_after=decode_cursor(params.cursor, sort),
+        facets=facets and filtered,
     )
-    await cache.set(cache_key, items)
-    return items
+    if facets and not filtered:
+        page, all_facets = await asyncio.gather(
+            listing, _all_films_facets(cache, film_service)
+        )
+        page.facets = all_facets
+    else:
+        page = await listing
+    return cursor_page(page, sort)
 
 
 @router.get("/search/", 
-            response_model=list[FilmShortSerializer],
+            response_model=list[FilmShortSerializer] | FilmFacetedPageSerializer,
             summary="Поиск кинопроизведений",
             description="Полнотекстовый поиск по кинопроизведениям",
             response_description="Название и рейтинг фильма"
             )
+@cached_response(
+    "films:search", tags=("films",), normalize={"query": normalize_search_query}
+)
 async def films_search(
-    request: Request,
     _: ResilientCurrentUser,
     query: str = Query(..., min_length=1, description="Поисковая фраза"),
     params: PageParams = Depends(get_pagination_params),
+    facets: bool = Query(False, description="Добавить количество фильмов по жанрам и рейтингу"),
     film_service: FilmService = Depends(get_film_service),
-    cache: CacheService = Depends(get_cache_service),
-) -> list[dict[str, Any]]:
-    cache_key = cache.build_key(
-        "films:search",
-        {
-            "path": str(request.url.path),
-            "params": sorted(request.query_params.multi_items()),
-        },
-    )
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    items = await film_service.search_films(
+) -> Any:
+    page = await film_service.search_films(
         query=query,
         page_size=params.page_size,
         page_number=params.page_number,
+        facets=facets,
     )
-    await cache.set(cache_key, items)
-    return items
+    return page_content(page)
 
 
 @router.get("/{film_id}", 
             response_model=FilmDetailSerializer,
             summary="Поиск фильма",
             description="Получение описания фильма")
+@cached_response(
+    "films:detail",
+    tags=("films:{film_id}",),
+    negative_ttl=settings.cache_negative_ttl,
+    not_found_detail="Фильм не найден",
+)
 async def film_details(
     film_id: uuid.UUID,
-     _: ResilientCurrentUser,
+    _: ResilientCurrentUser,
+    film_service: FilmService = Depends(get_film_service),
+) -> dict[str, Any] | None:
+    return await film_service.get_film(str(film_id))
+
+
+@router.get("/{film_id}/persons",
+            response_model=FilmWithPersonsSerializer,
+            summary="Участники фильма",
+            description="Фильм и его участники с ролями")
+@cached_response(
+    "films:persons",
+    tags=("films:{film_id}", "persons"),
+    negative_ttl=settings.cache_negative_ttl,
+    not_found_detail="Фильм не найден",
+)
+async def film_persons(
+    film_id: uuid.UUID,
+    _: ResilientCurrentUser,
+    film_service: FilmService = Depends(get_film_service),
+) -> dict[str, Any] | None:
+    return await film_service.film_participants(str(film_id))
+
+
+@router.post("/batch",
+             response_model=list[FilmDetailSerializer],
+             summary="Несколько фильмов",
+             description="Описания фильмов по списку идентификаторов, "
+                         "ненайденные фильмы пропускаются")
+async def films_batch(
+    payload: FilmBatchRequest,
+    _: ResilientCurrentUser,
     film_service: FilmService = Depends(get_film_service),
     cache: CacheService = Depends(get_cache_service),
-) -> dict[str, Any]:
-    cache_key = cache.build_key("films:detail", {"film_id": str(film_id)})
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    document = await film_service.get_film(str(film_id))
-    if document is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Фильм не найден")
-    await cache.set(cache_key, document)
-    return document
+) -> Response:
+    film_ids = list(dict.fromkeys(payload.ids))
+    calls = [
+        film_details.cached_call(film_id=film_id, _=None, film_service=film_service)
+        for film_id in film_ids
+    ]
+    entries = await cache.get_many_entries([call.key for call in calls])
+    bodies = [None if entry is None else entry.body for entry in entries]
+    # Negative entries are known misses, only ids with no entry go to ES.
+    missing = [index for index, entry in enumerate(entries) if entry is None]
+    if missing:
+        films = await film_service.get_films([str(film_ids[index]) for index in missing])
+        # Ids ES does not know are remembered as negative entries as well.
+        loaded: dict[str, bytes | None] = {}
+        for index, film in zip(missing, films):
+            body = None if film is None else CacheService.dumps(film)
+            bodies[index] = loaded[calls[index].key] = body
+        await cache.set_many_raw(
+            loaded,
+            tags={call.key: call.tags for call in calls if call.key in loaded},
+            negative_ttl=calls[0].negative_ttl,
+        )
+    content = b"[" + b",".join(body for body in bodies if body is not None) + b"]"
+    return Response(content=content, media_type="application/json")
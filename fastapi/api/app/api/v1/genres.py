@@ -3,14 +3,21 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, Query
 
+from ...core.config import settings
 from ...core.dependencies import get_cache_service, get_genre_service
 from ...core.security import ResilientCurrentUser
 from ...db.serializers.genre import GenreSerializer
-from ...services.cache import CacheService
+from ...services.cache import CacheService, WithHeaders
 from ...services.genres import GenreService
-from ...utils.pagination import PageParams, get_pagination_params
+from ...utils.caching import cache_details, cached_response
+from ...utils.pagination import (
+    CursorPageParams,
+    cursor_page,
+    decode_cursor,
+    get_cursor_pagination_params,
+)
 
 router = APIRouter(prefix="/genres", tags=["Жанры"])
 
@@ -19,51 +26,44 @@ router = APIRouter(prefix="/genres", tags=["Жанры"])
             response_model=list[GenreSerializer],
             summary="Список жанров фильмов",
             description="Информация о жанрах фильмов")
+@cached_response("genres:list", tags=("genres",))
 async def list_genres(
-    request: Request,
     _: ResilientCurrentUser,
-    params: PageParams = Depends(get_pagination_params),
+    params: CursorPageParams = Depends(get_cursor_pagination_params),
     sort: str | None = Query(None, description="Сортировка жанров фильмов по названию"),
     genre_service: GenreService = Depends(get_genre_service),
     cache: CacheService = Depends(get_cache_service),
-) -> list[dict[str, Any]]:
-    cache_key = cache.build_key(
-        "genres:list",
-        {
-            "path": str(request.url.path),
-            "params": sorted(request.query_params.multi_items()),
-        },
-    )
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    genres = await genre_service.list_genres(
+) -> WithHeaders:
+    page = await genre_service.list_genres(
         page_size=params.page_size,
         page_number=params.page_number,
         sort=sort,
+        search_after=decode_cursor(params.cursor, sort),
+    )
+    await cache_details(
+        cache,
+        "genres:detail",
+        page.items,
+        id_param="genre_id",
+        tags=("genres:{genre_id}",),
+        max_items=settings.cache_prime_details_max,
     )
-    await cache.set(cache_key, genres)
-    return genres
+    return cursor_page(page, sort)
 
 
 @router.get("/{genre_id}", 
             response_model=GenreSerializer,
             summary="Поиск жанра фильма",
             description="Информация о жанре фильма")
+@cached_response(
+    "genres:detail",
+    tags=("genres:{genre_id}",),
+    negative_ttl=settings.cache_negative_ttl,
+    not_found_detail="Жанр не найден",
+)
 async def genre_details(
     genre_id: uuid.UUID,
     _: ResilientCurrentUser,
     genre_service: GenreService = Depends(get_genre_service),
-    cache: CacheService = Depends(get_cache_service),
-) -> dict[str, Any]:
-    cache_key = cache.build_key("genres:detail", {"genre_id": str(genre_id)})
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    genre = await genre_service.get_genre(str(genre_id))
-    if genre is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Жанр не найден")
-    await cache.set(cache_key, genre)
-    return genre
+) -> dict[str, Any] | None:
+    return await genre_service.get_genre(str(genre_id))
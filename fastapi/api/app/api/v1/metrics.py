@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hmac
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+
+from ...core.config import settings
+
+
+def require_metrics_token(
+    x_metrics_token: str | None = Header(None, include_in_schema=False),
+) -> None:
+    """Hide the endpoint unless ``METRICS_TOKEN`` is set and sent back."""
+    expected = settings.metrics_token
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_metrics_token is None or not hmac.compare_digest(
+        x_metrics_token.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token"
+        )
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Метрики"],
+    dependencies=[Depends(require_metrics_token)],
+)
+
+
+@router.get("/",
+            summary="Метрики воркера",
+            description="Счётчики кэша, пула соединений Elasticsearch и проверки токенов текущего процесса",
+            include_in_schema=False)
+async def worker_metrics(request: Request) -> dict[str, Any]:
+    state = request.app.state
+    metrics: dict[str, Any] = {}
+
+    stats = getattr(state, "cache_stats", None)
+    local_cache = getattr(state, "local_cache", None)
+    metrics["cache"] = {
+        "stats": stats.as_dict() if stats is not None else {},
+        "local": local_cache.info() if local_cache is not None else None,
+    }
+    pool_stats = getattr(state, "es_pool_stats", None)
+    metrics["elasticsearch"] = {
+        "pool": pool_stats.as_dict() if pool_stats is not None else {},
+    }
+    token_cache = getattr(state, "auth_token_cache", None)
+    auth_client = getattr(state, "auth_client", None)
+    metrics["auth"] = {
+        "token_cache": token_cache.info() if token_cache is not None else None,
+        "client": auth_client.stats() if auth_client is not None else {},
+    }
+    return metrics
@@ -3,20 +3,24 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, Query
 
-from ...core.dependencies import (
-    get_cache_service,
-    get_film_service,
-    get_person_service,
-)
+from ...core.config import settings
+from ...core.dependencies import get_cache_service, get_person_service
 from ...core.security import ResilientCurrentUser
 from ...db.serializers.film import FilmShortSerializer
 from ...db.serializers.person import PersonDetailSerializer
-from ...services.cache import CacheService
-from ...services.films import FilmService
+from ...services.cache import CacheService, WithHeaders
 from ...services.persons import PersonService
-from ...utils.pagination import PageParams, get_pagination_params
+from ...utils.caching import cache_details, cached_response, normalize_search_query
+from ...utils.pagination import (
+    CursorPageParams,
+    PageParams,
+    cursor_page,
+    decode_cursor,
+    get_cursor_pagination_params,
+    get_pagination_params,
+)
 
 router = APIRouter(prefix="/persons", tags=["Персоны"])
 
@@ -25,113 +29,80 @@ router = APIRouter(prefix="/persons", tags=["Персоны"])
             response_model=list[PersonDetailSerializer],
             summary="Список персон",
             description="Информация о персонах")
+@cached_response("persons:list", tags=("persons",))
 async def list_persons(
-    request: Request,
     _: ResilientCurrentUser,
-    params: PageParams = Depends(get_pagination_params),
+    params: CursorPageParams = Depends(get_cursor_pagination_params),
     sort: str | None = Query(None, description="Сортировка персон по именам"),
     person_service: PersonService = Depends(get_person_service),
     cache: CacheService = Depends(get_cache_service),
-) -> list[dict[str, Any]]:
-    cache_key = cache.build_key(
-        "persons:list",
-        {
-            "path": str(request.url.path),
-            "params": sorted(request.query_params.multi_items()),
-        },
-    )
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    persons = await person_service.list_persons(
+) -> WithHeaders:
+    page = await person_service.list_persons(
         page_size=params.page_size,
         page_number=params.page_number,
         sort=sort,
+        search_after=decode_cursor(params.cursor, sort),
+    )
+    await cache_details(
+        cache,
+        "persons:detail",
+        page.items,
+        id_param="person_id",
+        tags=("persons:{person_id}",),
+        max_items=settings.cache_prime_details_max,
     )
-    await cache.set(cache_key, persons)
-    return persons
+    return cursor_page(page, sort)
 
 
 @router.get("/search/", 
             response_model=list[PersonDetailSerializer],
             summary="Поиск персон",
             description="Полнотекстовый поиск по персонам фильмов")
+@cached_response(
+    "persons:search", tags=("persons",), normalize={"query": normalize_search_query}
+)
 async def search_persons(
-    request: Request,
     _: ResilientCurrentUser,
     query: str = Query(..., min_length=1),
     params: PageParams = Depends(get_pagination_params),
     person_service: PersonService = Depends(get_person_service),
-    cache: CacheService = Depends(get_cache_service),
 ) -> list[dict[str, Any]]:
-    cache_key = cache.build_key(
-        "persons:search",
-        {
-            "path": str(request.url.path),
-            "params": sorted(request.query_params.multi_items()),
-        },
-    )
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    persons = await person_service.search_persons(
+    return await person_service.search_persons(
         query=query,
         page_size=params.page_size,
         page_number=params.page_number,
     )
-    await cache.set(cache_key, persons)
-    return persons
 
 
 @router.get("/{person_id}", 
             response_model=PersonDetailSerializer,
             summary="Поиск персоны",
             description="Информация о персоне")
+@cached_response(
+    "persons:detail",
+    tags=("persons:{person_id}",),
+    negative_ttl=settings.cache_negative_ttl,
+    not_found_detail="Персона не найдена",
+)
 async def person_details(
     person_id: uuid.UUID,
     _: ResilientCurrentUser,
     person_service: PersonService = Depends(get_person_service),
-    cache: CacheService = Depends(get_cache_service),
-) -> dict[str, Any]:
-    cache_key = cache.build_key("persons:detail", {"person_id": str(person_id)})
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    person = await person_service.get_person(str(person_id))
-    if person is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Персона не найдена")
-    await cache.set(cache_key, person)
-    return person
+) -> dict[str, Any] | None:
+    return await person_service.get_person(str(person_id))
 
 
 @router.get("/{person_id}/film", 
             response_model=list[FilmShortSerializer],
             summary="Поиск персоны фильма",
             description="Получение информации о персонах фильма")
+@cached_response("persons:films", tags=("films", "persons:{person_id}"))
 async def person_films(
     person_id: uuid.UUID,
     _: ResilientCurrentUser,
     params: PageParams = Depends(get_pagination_params),
-    film_service: FilmService = Depends(get_film_service),
-    cache: CacheService = Depends(get_cache_service),
+    person_service: PersonService = Depends(get_person_service),
 ) -> list[dict[str, Any]]:
-    cache_key = cache.build_key(
-        "persons:films",
-        {
-            "person_id": str(person_id),
-            "page_size": params.page_size,
-            "page_number": params.page_number,
-        },
-    )
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    films = await film_service.films_by_person(
+    return await person_service.person_films(
         str(person_id), page_size=params.page_size, page_number=params.page_number
     )
-    await cache.set(cache_key, films)
-    return films
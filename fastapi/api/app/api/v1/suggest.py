@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+
+from ...core.dependencies import get_film_service, get_person_service
+from ...core.security import ResilientCurrentUser
+from ...db.serializers.suggest import SuggestSerializer
+from ...services.films import FilmService
+from ...services.persons import PersonService
+from ...utils.caching import cached_response, normalize_search_query
+
+router = APIRouter(prefix="/suggest", tags=["Подсказки"])
+
+
+@router.get("/",
+            response_model=SuggestSerializer,
+            summary="Подсказки поиска",
+            description="Фильмы и персоны, названия и имена которых начинаются с введённого текста")
+@cached_response(
+    "suggest", tags=("films", "persons"), normalize={"query": normalize_search_query}
+)
+async def suggest(
+    _: ResilientCurrentUser,
+    query: str = Query(..., min_length=1, max_length=100, description="Введённый текст"),
+    size: int = Query(5, ge=1, le=20, description="Количество подсказок каждого типа"),
+    film_service: FilmService = Depends(get_film_service),
+    person_service: PersonService = Depends(get_person_service),
+) -> dict[str, Any]:
+    films, persons = await asyncio.gather(
+        film_service.suggest_films(query, size=size),
+        person_service.suggest_persons(query, size=size),
+    )
+    return {"films": films, "persons": persons}
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     project_name: str = Field(alias="PROJECT_NAME")
     project_description: str = Field(alias="PROJECT_DESCRIPTION")
     project_version: str = Field(alias="PROJECT_VERSION")
+    # /api/v1/metrics/ answers only requests with this X-Metrics-Token,
+    # without a token the endpoint is disabled.
+    metrics_token: str | None = Field(default=None, alias="METRICS_TOKEN")
 
     es_host: str = Field(alias="ES_HOST")
     es_port: int = Field(alias="ES_PORT")
@@ -26,11 +29,67 @@ class Settings(BaseSettings):
     es_movies_index: str = Field(alias="ES_MOVIES_INDEX")
     es_genres_index: str = Field(alias="ES_GENRES_INDEX")
     es_persons_index: str = Field(alias="ES_PERSONS_INDEX")
+    es_connections_per_node: int = Field(default=10, alias="ES_CONNECTIONS_PER_NODE")
+    es_request_timeout: float = Field(default=10.0, alias="ES_REQUEST_TIMEOUT")
+    es_detail_timeout: float = Field(default=2.0, alias="ES_DETAIL_TIMEOUT")
+    es_search_timeout: float = Field(default=5.0, alias="ES_SEARCH_TIMEOUT")
+    es_max_retries: int = Field(default=3, alias="ES_MAX_RETRIES")
+    es_retry_on_timeout: bool = Field(default=False, alias="ES_RETRY_ON_TIMEOUT")
+    es_http_compress: bool = Field(default=False, alias="ES_HTTP_COMPRESS")
+    es_sniff_on_start: bool = Field(default=False, alias="ES_SNIFF_ON_START")
+    es_sniff_on_node_failure: bool = Field(
+        default=False, alias="ES_SNIFF_ON_NODE_FAILURE"
+    )
+    es_sniff_timeout: float = Field(default=1.0, alias="ES_SNIFF_TIMEOUT")
+    es_min_delay_between_sniffing: float = Field(
+        default=60.0, alias="ES_MIN_DELAY_BETWEEN_SNIFFING"
+    )
 
     redis_host: str = Field(alias="REDIS_HOST")
     redis_port: int = Field(alias="REDIS_PORT")
     redis_db: int = Field(alias="REDIS_DB")
     cache_expire: int = Field(alias="CACHE_EXPIRE_SECONDS")
+    cache_stale_ttl: int = Field(default=0, alias="CACHE_STALE_SECONDS")
+    cache_negative_ttl: int = Field(default=10, alias="CACHE_NEGATIVE_TTL_SECONDS")
+    cache_facets_ttl: int = Field(default=600, alias="CACHE_FACETS_TTL_SECONDS")
+    # List pages store at most this many items under their detail keys.
+    cache_prime_details_max: int = Field(
+        default=50, alias="CACHE_PRIME_DETAILS_MAX"
+    )
+    cache_compress_min_bytes: int = Field(
+        default=0, alias="CACHE_COMPRESS_MIN_BYTES"
+    )
+    cache_compression: str = Field(default="zlib", alias="CACHE_COMPRESSION")
+    cache_local_enabled: bool = Field(default=False, alias="CACHE_LOCAL_ENABLED")
+    cache_local_max_entries: int = Field(
+        default=1024, alias="CACHE_LOCAL_MAX_ENTRIES"
+    )
+    cache_local_max_bytes: int = Field(
+        default=16 * 1024 * 1024, alias="CACHE_LOCAL_MAX_BYTES"
+    )
+    cache_local_ttl_seconds: float = Field(
+        default=5.0, alias="CACHE_LOCAL_TTL_SECONDS"
+    )
+    cache_invalidation_enabled: bool = Field(
+        default=True, alias="CACHE_INVALIDATION_ENABLED"
+    )
+    cache_invalidation_channel: str = Field(
+        default="cache:invalidate", alias="CACHE_INVALIDATION_CHANNEL"
+    )
+    cache_warmup_enabled: bool = Field(default=False, alias="CACHE_WARMUP_ENABLED")
+    cache_warmup_pages: int = Field(default=2, alias="CACHE_WARMUP_PAGES")
+    cache_warmup_top_films: int = Field(default=100, alias="CACHE_WARMUP_TOP_FILMS")
+    cache_warmup_rate: float = Field(default=20.0, alias="CACHE_WARMUP_RATE")
+    cache_warmup_lock_seconds: float = Field(
+        default=600.0, alias="CACHE_WARMUP_LOCK_SECONDS"
+    )
+    cache_lock_enabled: bool = Field(default=False, alias="CACHE_LOCK_ENABLED")
+    cache_lock_timeout_seconds: float = Field(
+        default=5.0, alias="CACHE_LOCK_TIMEOUT_SECONDS"
+    )
+    cache_lock_poll_interval_seconds: float = Field(
+        default=0.05, alias="CACHE_LOCK_POLL_INTERVAL_SECONDS"
+    )
 
     auth_service_url: AnyUrl = Field(
         default="http://auth-api:8000", alias="AUTH_SERVICE_URL"
@@ -51,9 +110,77 @@ class Settings(BaseSettings):
     auth_service_backoff_factor: float = Field(
         default=0.5, alias="AUTH_SERVICE_BACKOFF_FACTOR"
     )
+    auth_service_max_connections: int = Field(
+        default=100, alias="AUTH_SERVICE_MAX_CONNECTIONS"
+    )
+    auth_service_max_keepalive_connections: int = Field(
+        default=20, alias="AUTH_SERVICE_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    auth_service_keepalive_expiry: float = Field(
+        default=30.0, alias="AUTH_SERVICE_KEEPALIVE_EXPIRY"
+    )
+    auth_service_http2: bool = Field(
+        default=False, alias="AUTH_SERVICE_HTTP2"
+    )
+    auth_breaker_enabled: bool = Field(
+        default=True, alias="AUTH_BREAKER_ENABLED"
+    )
+    auth_breaker_failure_rate: float = Field(
+        default=0.5, alias="AUTH_BREAKER_FAILURE_RATE"
+    )
+    auth_breaker_minimum_calls: int = Field(
+        default=10, alias="AUTH_BREAKER_MINIMUM_CALLS"
+    )
+    auth_breaker_window_size: int = Field(
+        default=20, alias="AUTH_BREAKER_WINDOW_SIZE"
+    )
+    auth_breaker_open_seconds: float = Field(
+        default=30.0, alias="AUTH_BREAKER_OPEN_SECONDS"
+    )
+    auth_breaker_half_open_calls: int = Field(
+        default=1, alias="AUTH_BREAKER_HALF_OPEN_CALLS"
+    )
+    auth_adaptive_timeout_enabled: bool = Field(
+        default=True, alias="AUTH_ADAPTIVE_TIMEOUT_ENABLED"
+    )
+    auth_adaptive_timeout_min: float = Field(
+        default=0.5, alias="AUTH_ADAPTIVE_TIMEOUT_MIN"
+    )
+    auth_adaptive_timeout_multiplier: float = Field(
+        default=3.0, alias="AUTH_ADAPTIVE_TIMEOUT_MULTIPLIER"
+    )
     auth_cache_ttl_seconds: int = Field(
         default=60, alias="AUTH_CACHE_TTL_SECONDS"
     )
+    auth_local_cache_max_entries: int = Field(
+        default=10_000, alias="AUTH_LOCAL_CACHE_MAX_ENTRIES"
+    )
+    auth_local_cache_ttl_seconds: int = Field(
+        default=30, alias="AUTH_LOCAL_CACHE_TTL_SECONDS"
+    )
+    auth_jwt_local_enabled: bool = Field(
+        default=False, alias="AUTH_JWT_LOCAL_ENABLED"
+    )
+    auth_jwks_path: str = Field(
+        default="/.well-known/jwks.json", alias="AUTH_JWKS_PATH"
+    )
+    auth_jwks_refresh_seconds: int = Field(
+        default=300, alias="AUTH_JWKS_REFRESH_SECONDS"
+    )
+    auth_jwt_public_key: str | None = Field(
+        default=None, alias="AUTH_JWT_PUBLIC_KEY"
+    )
+    auth_jwt_algorithms: list[str] = Field(
+        default=["RS256"], alias="AUTH_JWT_ALGORITHMS"
+    )
+    auth_jwt_audience: str | None = Field(default=None, alias="AUTH_JWT_AUDIENCE")
+    auth_jwt_issuer: str | None = Field(default=None, alias="AUTH_JWT_ISSUER")
+    auth_jwt_leeway_seconds: int = Field(
+        default=10, alias="AUTH_JWT_LEEWAY_SECONDS"
+    )
+    auth_revocation_check_seconds: int = Field(
+        default=60, alias="AUTH_REVOCATION_CHECK_SECONDS"
+    )
 
     pg_host: str = Field(alias="POSTGRES_HOST")
     pg_port: int = Field(alias="POSTGRES_PORT")
@@ -3,12 +3,16 @@ from __future__ import annotations
 from fastapi import Depends, Request
 from elasticsearch import AsyncElasticsearch
 from redis.asyncio import Redis
+from starlette.datastructures import State
 
 from .config import settings
 from ..integrations.auth_client import AuthServiceClient
+from ..integrations.jwt_verifier import JwtVerifier
 from ..services.cache import CacheService
 from ..services.films import FilmService
 from ..services.genres import GenreService
+from ..services.local_cache import LocalCache
+from ..services.singleflight import SingleFlight
 from ..services.persons import PersonService
 
 
@@ -26,8 +30,23 @@ async def get_elastic(request: Request) -> AsyncElasticsearch:
     return client
 
 
-def get_cache_service(redis: Redis = Depends(get_redis)) -> CacheService:
-    return CacheService(redis=redis, ttl=settings.cache_expire)
+def create_cache_service(state: State, redis: Redis) -> CacheService:
+    return CacheService(
+        redis=redis,
+        ttl=settings.cache_expire,
+        stale_ttl=settings.cache_stale_ttl,
+        codec=getattr(state, "cache_codec", None),
+        local=getattr(state, "local_cache", None),
+        stats=getattr(state, "cache_stats", None),
+        flight=getattr(state, "single_flight", None),
+    )
+
+
+def get_cache_service(
+    request: Request,
+    redis: Redis = Depends(get_redis),
+) -> CacheService:
+    return create_cache_service(request.app.state, redis)
 
 
 async def get_auth_service_client(request: Request) -> AuthServiceClient:
@@ -37,6 +56,21 @@ async def get_auth_service_client(request: Request) -> AuthServiceClient:
     return client
 
 
+async def get_jwt_verifier(request: Request) -> JwtVerifier | None:
+    """Local token verifier, ``None`` when tokens are introspected remotely."""
+    return getattr(request.app.state, "jwt_verifier", None)
+
+
+async def get_auth_token_cache(request: Request) -> LocalCache | None:
+    """Verified tokens of this worker, ``None`` when the cache is disabled."""
+    return getattr(request.app.state, "auth_token_cache", None)
+
+
+async def get_auth_flight(request: Request) -> SingleFlight | None:
+    """Shares one introspection between concurrent checks of a token."""
+    return getattr(request.app.state, "auth_flight", None)
+
+
 def get_film_service(
     elastic: AsyncElasticsearch = Depends(get_elastic),
 ) -> FilmService:
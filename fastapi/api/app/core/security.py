@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import hashlib
+import logging
+import time
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Request, status
@@ -9,7 +11,13 @@ from pydantic import ValidationError
 from redis.asyncio import Redis
 
 from .config import settings
-from .dependencies import get_auth_service_client, get_redis
+from .dependencies import (
+    get_auth_flight,
+    get_auth_service_client,
+    get_auth_token_cache,
+    get_jwt_verifier,
+    get_redis,
+)
 from ..integrations.auth_client import (
     AuthServiceClient,
     AuthServiceError,
@@ -17,6 +25,11 @@ from ..integrations.auth_client import (
     AuthServiceUnavailableError,
     TokenIntrospectionResult,
 )
+from ..integrations.jwt_verifier import JwtVerifier, SigningKeysUnavailableError
+from ..services.local_cache import LocalCache
+from ..services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 http_bearer = HTTPBearer(auto_error=False)
 
@@ -46,9 +59,25 @@ async def _store_payload(redis: Redis, token: str, payload: TokenIntrospectionRe
     await redis.setex(_token_cache_key(token), ttl, payload.model_dump_json())
 
 
+def _remember_payload(
+    token_cache: LocalCache | None, digest: str, payload: TokenIntrospectionResult
+) -> None:
+    """Keep a verified payload in the worker, never past the token's ``exp``."""
+    if token_cache is None:
+        return
+    ttl = token_cache.ttl
+    if payload.exp is not None:
+        ttl = min(ttl, payload.exp.timestamp() - time.time())
+    if ttl > 0:
+        token_cache.set(digest, payload, size=1, ttl=ttl)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def _token_cache_key(token: str) -> str:
-    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
-    return f"auth:introspection:{digest}"
+    return f"auth:introspection:{_token_digest(token)}"
 
 
 def _extract_request_id(request: Request) -> str | None:
@@ -58,6 +87,60 @@ def _extract_request_id(request: Request) -> str | None:
     return getattr(request.state, "request_id", None)
 
 
+async def _resolve_payload(
+    request: Request,
+    token: str,
+    auth_client: AuthServiceClient,
+    redis: Redis,
+    verifier: JwtVerifier | None,
+    token_cache: LocalCache | None = None,
+    flight: SingleFlight | None = None,
+    *,
+    max_retries: int | None = None,
+) -> TokenIntrospectionResult:
+    """Verify ``token`` locally when a verifier is configured, otherwise
+    through the worker cache, the Redis cache and remote introspection.
+    Without signing keys the verifier cannot decide, the token then takes
+    the remote path as well.
+
+    Concurrent checks of the same token in this worker share one Redis
+    lookup, one introspection and one cache write through ``flight``.
+
+    Raises the ``AuthServiceError`` family, the callers map it to responses.
+    """
+    digest = _token_digest(token)
+    if verifier is not None:
+        try:
+            return await verifier.verify(token, digest)
+        except SigningKeysUnavailableError:
+            logger.warning("Signing keys unavailable, introspecting the token")
+
+    if token_cache is not None:
+        remembered = token_cache.get(digest)
+        if remembered is not None:
+            return remembered
+
+    async def load() -> TokenIntrospectionResult:
+        cached = await _load_cached_payload(redis, token)
+        if cached is not None:
+            _remember_payload(token_cache, digest, cached)
+            return cached
+
+        payload = await auth_client.introspect_token(
+            token,
+            request_id=_extract_request_id(request),
+            max_retries=max_retries,
+        )
+        if payload.active and payload.user_id:
+            await _store_payload(redis, token, payload)
+            _remember_payload(token_cache, digest, payload)
+        return payload
+
+    if flight is None:
+        return await load()
+    return await flight.do(f"auth:{digest}", load)
+
+
 async def get_current_user_payload(
     request: Request,
     credentials: Annotated[
@@ -66,6 +149,9 @@ async def get_current_user_payload(
     ],
     auth_client: AuthServiceClient = Depends(get_auth_service_client),
     redis: Redis = Depends(get_redis),
+    verifier: JwtVerifier | None = Depends(get_jwt_verifier),
+    token_cache: LocalCache | None = Depends(get_auth_token_cache),
+    flight: SingleFlight | None = Depends(get_auth_flight),
 ) -> TokenIntrospectionResult:
     if credentials is None:
         raise HTTPException(
@@ -74,17 +160,15 @@ async def get_current_user_payload(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
-
-    cached = await _load_cached_payload(redis, token)
-    if cached is not None:
-        return cached
-    
-    request_id = _extract_request_id(request)
-
     try:
-        payload = await auth_client.introspect_token(
-            token, request_id=request_id
+        payload = await _resolve_payload(
+            request,
+            credentials.credentials,
+            auth_client,
+            redis,
+            verifier,
+            token_cache,
+            flight,
         )
     except AuthServiceUnauthorizedError as exc:
         raise HTTPException(
@@ -109,8 +193,6 @@ async def get_current_user_payload(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-    await _store_payload(redis, token, payload)
     return payload
 
 
@@ -126,20 +208,22 @@ async def get_optional_user_payload(
     ],
     auth_client: AuthServiceClient = Depends(get_auth_service_client),
     redis: Redis = Depends(get_redis),
+    verifier: JwtVerifier | None = Depends(get_jwt_verifier),
+    token_cache: LocalCache | None = Depends(get_auth_token_cache),
+    flight: SingleFlight | None = Depends(get_auth_flight),
 ) -> TokenIntrospectionResult | None:
     if credentials is None:
         return None
 
-    token = credentials.credentials
-    cached = await _load_cached_payload(redis, token)
-    if cached is not None:
-        return cached
-    
-    request_id = _extract_request_id(request)
-
     try:
-        payload = await auth_client.introspect_token(
-            token, request_id=request_id
+        payload = await _resolve_payload(
+            request,
+            credentials.credentials,
+            auth_client,
+            redis,
+            verifier,
+            token_cache,
+            flight,
         )
     except AuthServiceUnauthorizedError:
         return None
@@ -150,8 +234,6 @@ async def get_optional_user_payload(
 
     if not payload.active or not payload.user_id:
         return None
-
-    await _store_payload(redis, token, payload)
     return payload
 
 
@@ -168,6 +250,9 @@ async def get_resilient_user_payload(
     ],
     auth_client: AuthServiceClient = Depends(get_auth_service_client),
     redis: Redis = Depends(get_redis),
+    verifier: JwtVerifier | None = Depends(get_jwt_verifier),
+    token_cache: LocalCache | None = Depends(get_auth_token_cache),
+    flight: SingleFlight | None = Depends(get_auth_flight),
 ) -> TokenIntrospectionResult | None:
     if credentials is None:
         raise HTTPException(
@@ -176,18 +261,15 @@ async def get_resilient_user_payload(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
-
-    cached = await _load_cached_payload(redis, token)
-    if cached is not None:
-        return cached
-
-    request_id = _extract_request_id(request)
-
     try:
-        payload = await auth_client.introspect_token(
-            token,
-            request_id=request_id,
+        payload = await _resolve_payload(
+            request,
+            credentials.credentials,
+            auth_client,
+            redis,
+            verifier,
+            token_cache,
+            flight,
             max_retries=1,
         )
     except AuthServiceUnauthorizedError as exc:
@@ -205,8 +287,6 @@ async def get_resilient_user_payload(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-    await _store_payload(redis, token, payload)
     return payload
 
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import uuid
+
 from pydantic import BaseModel, ConfigDict, Field
 
 from .genre import GenreSerializer
@@ -14,6 +16,13 @@ class FilmShortSerializer(BaseModel):
     imdb_rating: float | None = Field(default=None)
 
 
+class FilmSuggestSerializer(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    uuid: str = Field(alias="id", serialization_alias="uuid")
+    title: str
+
+
 class FilmDetailSerializer(FilmShortSerializer):
     description: str | None = None
     genre: list[GenreSerializer] = Field(
@@ -28,3 +37,28 @@ class FilmDetailSerializer(FilmShortSerializer):
 
 class FilmWithPersonsSerializer(FilmShortSerializer):
     persons: list[PersonFilmSerializer] = Field(default_factory=list)
+
+
+class GenreFacetSerializer(BaseModel):
+    name: str
+    count: int
+
+
+class RatingFacetSerializer(BaseModel):
+    # Lower bound of a one point wide imdb_rating bucket.
+    rating: float
+    count: int
+
+
+class FilmFacetsSerializer(BaseModel):
+    genres: list[GenreFacetSerializer] = Field(default_factory=list)
+    rating: list[RatingFacetSerializer] = Field(default_factory=list)
+
+
+class FilmFacetedPageSerializer(BaseModel):
+    items: list[FilmShortSerializer] = Field(default_factory=list)
+    facets: FilmFacetsSerializer
+
+
+class FilmBatchRequest(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=100)
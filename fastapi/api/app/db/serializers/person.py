@@ -17,10 +17,16 @@ class PersonShortSerializer(PersonBaseSerializer):
     pass
 
 
+class PersonFilmRolesSerializer(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    uuid: str = Field(alias="id", serialization_alias="uuid")
+    roles: list[str] = Field(default_factory=list)
+
 
 class PersonDetailSerializer(PersonBaseSerializer):
-    pass
+    films: list[PersonFilmRolesSerializer] = Field(default_factory=list)
 
 
 class PersonFilmSerializer(PersonBaseSerializer):
-    pass
+    roles: list[str] = Field(default_factory=list)
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+from .film import FilmSuggestSerializer
+from .person import PersonShortSerializer
+
+
+class SuggestSerializer(BaseModel):
+    films: list[FilmSuggestSerializer] = Field(default_factory=list)
+    persons: list[PersonShortSerializer] = Field(default_factory=list)
@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import datetime
 from http import HTTPStatus
+from typing import Any
 
 import httpx
 from pydantic import BaseModel, Field, ValidationError
 
+from .pool_stats import PoolStats
+from .resilience import HALF_OPEN, OPEN, AdaptiveTimeout, CircuitBreaker
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,8 +32,23 @@ class AuthServiceInvalidResponseError(AuthServiceError):
     """Authentication service returned malformed response."""
 
 
+# The first of these events of a request means it got a connection from the pool.
+_CONNECTION_ACQUIRED_EVENTS = (
+    "connect_tcp.started",
+    "send_request_headers.started",
+)
+
+
 class AuthServiceClient:
-    """HTTP client for communicating with the authentication service."""
+    """HTTP client for communicating with the authentication service.
+
+    With a ``breaker`` every call is rejected right away while the service is
+    known to be unhealthy. With ``adaptive_timeout`` each call gets a timeout
+    derived from the recent latency instead of the fixed ``timeout``.
+
+    ``http2`` needs the ``h2`` package and is negotiated over TLS, plain
+    ``http://`` URLs stay on HTTP/1.1.
+    """
 
     def __init__(
         self,
@@ -39,16 +59,47 @@ class AuthServiceClient:
         timeout: float = 5.0,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        jwks_path: str = "/.well-known/jwks.json",
+        breaker: CircuitBreaker | None = None,
+        adaptive_timeout: AdaptiveTimeout | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
     ) -> None:
-        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+        )
+        self.pool_stats = PoolStats(max_connections=max_connections)
         self._introspection_path = introspection_path
+        self._jwks_path = jwks_path
         self._internal_api_key = internal_api_key
         self._max_retries = max(1, max_retries)
         self._backoff_factor = max(0.0, backoff_factor)
+        self._breaker = breaker
+        self._adaptive_timeout = adaptive_timeout
 
     async def close(self) -> None:
         await self._client.aclose()
 
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pool": self.pool_stats.as_dict(),
+            "breaker": self._breaker.as_dict() if self._breaker is not None else None,
+            "timeout": (
+                self._adaptive_timeout.as_dict()
+                if self._adaptive_timeout is not None
+                else None
+            ),
+        }
+
     async def introspect_token(
         self,
         token: str,
@@ -74,7 +125,8 @@ class AuthServiceClient:
 
         for attempt in range(1, attempts_limit + 1):
             try:
-                response = await self._client.post(
+                response = await self._send(
+                    "POST",
                     self._introspection_path,
                     json=payload,
                     headers=headers,
@@ -132,9 +184,93 @@ class AuthServiceClient:
 
         raise AuthServiceUnavailableError("Authentication service unavailable")
 
+    async def fetch_jwks(self) -> dict[str, Any]:
+        """Public keys the authentication service signs tokens with."""
+
+        try:
+            response = await self._send("GET", self._jwks_path)
+        except httpx.RequestError as exc:
+            raise AuthServiceUnavailableError("Authentication service unavailable") from exc
+
+        if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            raise AuthServiceUnavailableError("Authentication service unavailable")
+        if response.status_code != HTTPStatus.OK:
+            raise AuthServiceError(
+                f"Authentication service returned {response.status_code} for JWKS"
+            )
+        try:
+            data = response.json()
+        except ValueError as exc:
+            raise AuthServiceInvalidResponseError(
+                "Failed to decode JWKS response as JSON"
+            ) from exc
+        if not isinstance(data, dict) or not isinstance(data.get("keys"), list):
+            raise AuthServiceInvalidResponseError("JWKS response has no keys")
+        return data
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """One request, reported to the breaker and the adaptive timeout.
+
+        Network errors and 5xx responses count as failures. Raises
+        ``AuthServiceUnavailableError`` without a request when the circuit
+        is open. Half-open probes get the full timeout, a slow but healthy
+        service must be able to close the circuit again.
+        """
+        if self._breaker is not None and not self._breaker.allow():
+            raise AuthServiceUnavailableError("Authentication service circuit is open")
+        if self._adaptive_timeout is not None:
+            probe = self._breaker is not None and self._breaker.state == HALF_OPEN
+            kwargs["timeout"] = (
+                self._adaptive_timeout.maximum
+                if probe
+                else self._adaptive_timeout.current
+            )
+
+        pool = self.pool_stats
+        pool.request_started()
+        started = time.monotonic()
+        acquired = False
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            nonlocal acquired
+            if not acquired and event.endswith(_CONNECTION_ACQUIRED_EVENTS):
+                acquired = True
+                pool.observe_wait(time.monotonic() - started)
+
+        kwargs["extensions"] = {"trace": trace}
+        try:
+            response = await self._client.request(method, url, **kwargs)
+        except httpx.RequestError as exc:
+            if self._breaker is not None:
+                self._breaker.record_failure()
+            if isinstance(exc, httpx.TimeoutException):
+                pool.timeouts += 1
+                if self._adaptive_timeout is not None:
+                    self._adaptive_timeout.timed_out(time.monotonic() - started)
+            raise
+        except BaseException:
+            if self._breaker is not None:
+                self._breaker.release()
+            raise
+        finally:
+            pool.request_finished()
+
+        if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            if self._breaker is not None:
+                self._breaker.record_failure()
+            return response
+        if self._breaker is not None:
+            self._breaker.record_success()
+        if self._adaptive_timeout is not None:
+            self._adaptive_timeout.observe(time.monotonic() - started)
+        return response
+
     async def _maybe_sleep(self, attempt: int, attempts_limit: int) -> None:
         if attempt >= attempts_limit:
             return
+        if self._breaker is not None and self._breaker.state == OPEN:
+            # The next attempt fails fast anyway.
+            return
         delay = self._backoff_factor * (2 ** (attempt - 1))
         if delay > 0:
             await asyncio.sleep(delay)
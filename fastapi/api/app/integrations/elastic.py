@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any
+
+from elastic_transport import AiohttpHttpNode, ConnectionTimeout
+from elasticsearch import AsyncElasticsearch
+
+from ..core.config import Settings
+from .pool_stats import PoolStats
+
+
+class ElasticPoolStats:
+    """Per-worker connection pool counters, one entry per node."""
+
+    def __init__(self) -> None:
+        self._nodes: dict[str, PoolStats] = {}
+
+    def node(self, url: str, connections: int) -> PoolStats:
+        stats = self._nodes.get(url)
+        if stats is None:
+            stats = self._nodes[url] = PoolStats(max_connections=connections)
+        return stats
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        return {url: stats.as_dict() for url, stats in self._nodes.items()}
+
+
+def instrumented_node_class(stats: ElasticPoolStats) -> type[AiohttpHttpNode]:
+    """aiohttp node class that reports its pool usage to ``stats``.
+
+    The transport creates nodes itself (also the ones found by sniffing), so
+    the counters are bound to the class rather than passed to each node.
+    """
+
+    class InstrumentedAiohttpNode(AiohttpHttpNode):
+        async def perform_request(self, *args: Any, **kwargs: Any) -> Any:
+            node = stats.node(self.base_url, self.config.connections_per_node)
+            node.request_started()
+            try:
+                return await super().perform_request(*args, **kwargs)
+            except ConnectionTimeout:
+                node.timeouts += 1
+                raise
+            finally:
+                node.request_finished()
+
+    return InstrumentedAiohttpNode
+
+
+def create_elastic(
+    settings: Settings,
+    *,
+    stats: ElasticPoolStats | None = None,
+) -> AsyncElasticsearch:
+    """Elasticsearch client with pool, timeout, retry and sniffing settings.
+
+    ``es_connections_per_node`` is per worker process: with gunicorn the node
+    sees up to ``workers * es_connections_per_node`` connections.
+    """
+    sniffing: dict[str, Any] = {}
+    if settings.es_sniff_on_start or settings.es_sniff_on_node_failure:
+        # Any sniffing option turns sniffing on in the client, and
+        # min_delay_between_sniffing also re-sniffs before requests.
+        sniffing = {
+            "sniff_on_start": settings.es_sniff_on_start,
+            "sniff_on_node_failure": settings.es_sniff_on_node_failure,
+            "sniff_timeout": settings.es_sniff_timeout,
+            "min_delay_between_sniffing": settings.es_min_delay_between_sniffing,
+        }
+    return AsyncElasticsearch(
+        hosts=[settings.es_url],
+        connections_per_node=settings.es_connections_per_node,
+        request_timeout=settings.es_request_timeout,
+        max_retries=settings.es_max_retries,
+        retry_on_timeout=settings.es_retry_on_timeout,
+        http_compress=settings.es_http_compress,
+        node_class=instrumented_node_class(stats) if stats is not None else AiohttpHttpNode,
+        **sniffing,
+    )
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+import jwt
+from pydantic import ValidationError
+
+from .auth_client import (
+    AuthServiceClient,
+    AuthServiceError,
+    AuthServiceInvalidResponseError,
+    AuthServiceUnauthorizedError,
+    AuthServiceUnavailableError,
+    TokenIntrospectionResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# An unknown kid forces a JWKS refresh, but not more often than this, so that
+# garbage tokens cannot hammer the authentication service.
+MIN_JWKS_REFRESH_INTERVAL = 30.0
+MAX_TRACKED_TOKENS = 10_000
+
+
+class SigningKeysUnavailableError(AuthServiceUnavailableError):
+    """No signing keys could be loaded, the token was not checked at all."""
+
+
+class JwtVerifier:
+    """Verifies signed access tokens in-process.
+
+    Signing keys come from the authentication service JWKS (refreshed every
+    ``jwks_refresh_seconds`` and when a token names an unknown ``kid``) or
+    from a static ``public_key``. Revocation is the only thing local
+    verification cannot see: every ``revocation_check_seconds`` a token is
+    introspected remotely in the background, and revoked tokens are rejected
+    from then on. ``0`` disables the checks.
+    """
+
+    def __init__(
+        self,
+        auth_client: AuthServiceClient,
+        *,
+        algorithms: Sequence[str],
+        public_key: str | None = None,
+        audience: str | None = None,
+        issuer: str | None = None,
+        leeway: int = 0,
+        jwks_refresh_seconds: int = 300,
+        revocation_check_seconds: int = 60,
+    ) -> None:
+        self._auth_client = auth_client
+        self._algorithms = list(algorithms)
+        self._public_key = public_key or None
+        self._audience = audience or None
+        self._issuer = issuer or None
+        self._leeway = leeway
+        self._jwks_refresh_seconds = jwks_refresh_seconds
+        self._revocation_check_seconds = revocation_check_seconds
+        self._keys: dict[str | None, Any] = {}
+        # Monotonic time of the last JWKS load, None until the first one.
+        self._keys_loaded_at: float | None = None
+        self._jwks_lock = asyncio.Lock()
+        # token digest -> monotonic time of the next revocation check
+        self._next_check: OrderedDict[str, float] = OrderedDict()
+        # token digest -> exp of a revoked token
+        self._revoked: dict[str, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def verify(self, token: str, digest: str) -> TokenIntrospectionResult:
+        """Claims of a valid token, ``digest`` identifies it in the checks.
+
+        Raises ``AuthServiceUnauthorizedError`` for invalid, expired or
+        revoked tokens and ``SigningKeysUnavailableError`` when the keys
+        cannot be loaded.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as exc:
+            raise AuthServiceUnauthorizedError("Malformed token") from exc
+        key = await self._signing_key(header.get("kid"))
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=self._algorithms,
+                audience=self._audience,
+                issuer=self._issuer,
+                leeway=self._leeway,
+                options={"require": ["exp", "sub"], "verify_aud": bool(self._audience)},
+            )
+        except jwt.PyJWTError as exc:
+            raise AuthServiceUnauthorizedError("Invalid token") from exc
+
+        if digest in self._revoked:
+            raise AuthServiceUnauthorizedError("Token revoked")
+        self._schedule_revocation_check(token, digest, float(claims["exp"]))
+        return self._to_result(claims)
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _signing_key(self, kid: str | None) -> Any:
+        if self._public_key is not None:
+            return self._public_key
+        if self._keys_due(kid):
+            async with self._jwks_lock:
+                # Somebody else may have refreshed while we waited.
+                if self._keys_due(kid):
+                    try:
+                        await self._refresh_keys()
+                    except AuthServiceError as exc:
+                        raise SigningKeysUnavailableError(
+                            "Signing keys unavailable"
+                        ) from exc
+        key = self._keys.get(kid)
+        if key is None and kid is None and len(self._keys) == 1:
+            key = next(iter(self._keys.values()))
+        if key is None:
+            raise AuthServiceUnauthorizedError("Unknown signing key")
+        return key
+
+    def _keys_due(self, kid: str | None) -> bool:
+        if self._keys_loaded_at is None:
+            return True
+        age = time.monotonic() - self._keys_loaded_at
+        if age >= self._jwks_refresh_seconds:
+            return True
+        return kid not in self._keys and age >= MIN_JWKS_REFRESH_INTERVAL
+
+    async def _refresh_keys(self) -> None:
+        try:
+            data = await self._auth_client.fetch_jwks()
+        except AuthServiceError:
+            if not self._keys:
+                raise
+            # Keep verifying with the keys we have until the service is back.
+            logger.warning("JWKS refresh failed, using cached keys", exc_info=True)
+            self._keys_loaded_at = time.monotonic()
+            return
+        keys: dict[str | None, Any] = {}
+        for jwk in data["keys"]:
+            try:
+                keys[jwk.get("kid")] = jwt.PyJWK(jwk).key
+            except jwt.PyJWTError:
+                logger.warning("Skipping unusable JWK %s", jwk.get("kid"))
+        if not keys:
+            raise AuthServiceInvalidResponseError("JWKS has no usable keys")
+        self._keys = keys
+        self._keys_loaded_at = time.monotonic()
+
+    def _schedule_revocation_check(self, token: str, digest: str, exp: float) -> None:
+        if self._revocation_check_seconds <= 0:
+            return
+        now = time.monotonic()
+        next_check = self._next_check.get(digest)
+        if next_check is not None and next_check > now:
+            return
+        self._next_check[digest] = now + self._revocation_check_seconds
+        self._next_check.move_to_end(digest)
+        while len(self._next_check) > MAX_TRACKED_TOKENS:
+            self._next_check.popitem(last=False)
+        task = asyncio.create_task(self._check_revocation(token, digest, exp))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _check_revocation(self, token: str, digest: str, exp: float) -> None:
+        try:
+            result = await self._auth_client.introspect_token(token, max_retries=1)
+        except AuthServiceUnauthorizedError:
+            result = None
+        except AuthServiceError as exc:
+            # Verified again at the next interval.
+            logger.info("Revocation check skipped: %s", exc)
+            return
+        if result is None or not result.active:
+            self._revoke(digest, exp)
+
+    def _revoke(self, digest: str, exp: float) -> None:
+        now = time.time()
+        self._revoked = {
+            revoked: expires for revoked, expires in self._revoked.items() if expires > now
+        }
+        self._revoked[digest] = exp
+
+    @staticmethod
+    def _to_result(claims: dict[str, Any]) -> TokenIntrospectionResult:
+        roles = [
+            {"id": role, "name": role} if isinstance(role, str) else role
+            for role in claims.get("roles") or []
+        ]
+        permissions = []
+        for permission in claims.get("permissions") or []:
+            if isinstance(permission, str):
+                # Compact form "resource:action".
+                resource, _, action = permission.partition(":")
+                permission = {"id": permission, "resource": resource, "action": action}
+            permissions.append(permission)
+        try:
+            return TokenIntrospectionResult(
+                active=True,
+                user_id=str(claims.get("user_id") or claims["sub"]),
+                username=claims.get("username") or claims.get("preferred_username"),
+                exp=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+                roles=roles,
+                permissions=permissions,
+            )
+        except ValidationError as exc:
+            raise AuthServiceUnauthorizedError("Unexpected token claims") from exc
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class PoolStats:
+    """Connection pool usage of one HTTP client or node in the current worker.
+
+    ``wait_seconds_*`` are only filled by clients that can tell when a request
+    got its connection, the others leave them at zero.
+    """
+
+    max_connections: int | None
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    # Requests that found every connection busy and had to wait for one.
+    queued: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def request_started(self) -> None:
+        self.requests += 1
+        if self.max_connections is not None and self.in_flight >= self.max_connections:
+            self.queued += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "saturation": (
+                round(self.in_flight / self.max_connections, 3)
+                if self.max_connections
+                else None
+            ),
+            "wait_seconds_avg": round(
+                self.wait_seconds_total / max(1, self.requests), 6
+            ),
+        }
+
+
+__all__ = ["PoolStats"]
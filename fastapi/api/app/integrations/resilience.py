@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for calls to one upstream service.
+
+    Closed, it counts the outcome of the last ``window_size`` calls and opens
+    once at least ``minimum_calls`` were made and the share of failures
+    reaches ``failure_rate_threshold``. Open, every call is rejected for
+    ``open_seconds``. Then it lets ``half_open_max_calls`` probes through:
+    the first failure opens it again, as many successes close it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 20,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self.name = name
+        self._failure_rate_threshold = failure_rate_threshold
+        self._window_size = max(1, window_size)
+        self._minimum_calls = min(max(1, minimum_calls), self._window_size)
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = max(1, half_open_max_calls)
+        self._state = CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=self._window_size)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._rejected = 0
+        self._transitions = 0
+        self._changed_at = time.time()
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._open_elapsed():
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now, reserves a probe when half-open."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self._half_open_max_calls:
+            self._probes += 1
+            return True
+        self._rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            self._probe_successes += 1
+            if self._probe_successes >= self._half_open_max_calls:
+                self._transition(CLOSED)
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        if self._state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        self._outcomes.append(False)
+        if self._state == CLOSED and self._failure_rate() >= self._failure_rate_threshold:
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back a probe whose call ended without an outcome."""
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failure_rate": round(self._failure_rate(), 3),
+            "calls": len(self._outcomes),
+            "rejected": self._rejected,
+            "transitions": self._transitions,
+            "changed_at": self._changed_at,
+        }
+
+    def _failure_rate(self) -> float:
+        if len(self._outcomes) < self._minimum_calls:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _open_elapsed(self) -> bool:
+        return time.monotonic() - self._opened_at >= self._open_seconds
+
+    def _transition(self, state: str) -> None:
+        previous, self._state = self._state, state
+        self._transitions += 1
+        self._changed_at = time.time()
+        self._probes = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            logger.warning(
+                "Circuit %s opened (%s -> %s, failure rate %.2f)",
+                self.name,
+                previous,
+                state,
+                self._failure_rate(),
+            )
+        else:
+            logger.info("Circuit %s: %s -> %s", self.name, previous, state)
+        if state == CLOSED:
+            self._outcomes.clear()
+
+
+class AdaptiveTimeout:
+    """Request timeout that follows the observed latency.
+
+    The timeout is the ``percentile`` of the last ``window_size`` calls
+    (successful and timed out) times ``multiplier``, clamped to
+    ``[minimum, maximum]``. Until ``minimum_samples`` calls were seen it
+    stays at ``maximum``.
+    """
+
+    def __init__(
+        self,
+        *,
+        minimum: float,
+        maximum: float,
+        multiplier: float = 3.0,
+        percentile: float = 0.99,
+        window_size: int = 200,
+        minimum_samples: int = 20,
+    ) -> None:
+        self._minimum = min(minimum, maximum)
+        self._maximum = maximum
+        self._multiplier = multiplier
+        self._percentile = percentile
+        self._minimum_samples = max(1, minimum_samples)
+        self._samples: deque[float] = deque(maxlen=max(1, window_size))
+        self._current = maximum
+
+    @property
+    def current(self) -> float:
+        return self._current
+
+    @property
+    def maximum(self) -> float:
+        return self._maximum
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._current = self._from_samples()
+
+    def timed_out(self, seconds: float) -> None:
+        """A call gave up after ``seconds``, the service got slower.
+
+        The elapsed time joins the window and the timeout at least doubles
+        towards ``maximum``, so a slowdown cannot keep every call timing out.
+        """
+        self._samples.append(seconds)
+        self._current = min(
+            self._maximum, max(self._from_samples(), self._current * 2)
+        )
+
+    def _from_samples(self) -> float:
+        if len(self._samples) < self._minimum_samples:
+            return self._current
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, math.ceil(self._percentile * len(ordered)) - 1)
+        return min(self._maximum, max(self._minimum, ordered[index] * self._multiplier))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "current": round(self._current, 3),
+            "minimum": self._minimum,
+            "maximum": self._maximum,
+            "samples": len(self._samples),
+        }
+
+
+__all__ = ["AdaptiveTimeout", "CircuitBreaker", "CLOSED", "HALF_OPEN", "OPEN"]
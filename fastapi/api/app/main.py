@@ -1,13 +1,27 @@
 from __future__ import annotations
 import asyncio
+import contextlib
+import logging
 from pathlib import Path
 from fastapi import FastAPI
-from elasticsearch import AsyncElasticsearch
+from elasticsearch import ApiError, AsyncElasticsearch, TransportError
 from redis.asyncio import Redis, from_url as redis_from_url
-from app.api.v1 import films, genres, persons
+from app.api.v1 import films, genres, metrics, persons, suggest
 from app.core.config import settings
+from app.core.dependencies import create_cache_service
 from app.db import models 
 from app.integrations.auth_client import AuthServiceClient
+from app.integrations.elastic import ElasticPoolStats, create_elastic
+from app.integrations.jwt_verifier import JwtVerifier
+from app.integrations.resilience import AdaptiveTimeout, CircuitBreaker
+from app.services.codecs import CacheCodec
+from app.services.invalidation import CacheInvalidationListener
+from app.services.local_cache import CacheStats, LocalCache
+from app.services.search_templates import put_search_templates
+from app.services.singleflight import SingleFlight
+from app.warmup import create_cache_warmer, run_exclusive
+
+logger = logging.getLogger(__name__)
 
 
 def create_app() -> FastAPI:
@@ -20,11 +34,57 @@ def create_app() -> FastAPI:
     app.include_router(films.router, prefix="/api/v1")
     app.include_router(genres.router, prefix="/api/v1")
     app.include_router(persons.router, prefix="/api/v1")
+    app.include_router(suggest.router, prefix="/api/v1")
+    app.include_router(metrics.router, prefix="/api/v1")
 
     @app.on_event("startup")
     async def startup() -> None:        
-        app.state.elastic = AsyncElasticsearch(hosts=[settings.es_url])
+        app.state.es_pool_stats = ElasticPoolStats()
+        app.state.elastic = create_elastic(settings, stats=app.state.es_pool_stats)
+        try:
+            await put_search_templates(app.state.elastic)
+        except (ApiError, TransportError):
+            logger.exception("Search templates were not stored, they are stored on first use")
         app.state.redis = redis_from_url(settings.redis_url)
+        app.state.cache_stats = CacheStats()
+        app.state.cache_codec = CacheCodec(
+            settings.cache_compression,
+            min_bytes=settings.cache_compress_min_bytes,
+        )
+        app.state.local_cache = (
+            LocalCache(
+                max_entries=settings.cache_local_max_entries,
+                max_bytes=settings.cache_local_max_bytes,
+                ttl=settings.cache_local_ttl_seconds,
+            )
+            if settings.cache_local_enabled
+            else None
+        )
+        app.state.single_flight = SingleFlight(
+            app.state.redis if settings.cache_lock_enabled else None,
+            lock_timeout=settings.cache_lock_timeout_seconds,
+            poll_interval=settings.cache_lock_poll_interval_seconds,
+        )
+        app.state.invalidation_task = None
+        if settings.cache_invalidation_enabled:
+            listener = CacheInvalidationListener(
+                app.state.redis,
+                create_cache_service(app.state, app.state.redis),
+                channel=settings.cache_invalidation_channel,
+            )
+            app.state.invalidation_task = asyncio.create_task(listener.run())
+        app.state.warmup_task = None
+        if settings.cache_warmup_enabled:
+            warmer = create_cache_warmer(
+                app.state.elastic, create_cache_service(app.state, app.state.redis)
+            )
+            app.state.warmup_task = asyncio.create_task(
+                run_exclusive(
+                    warmer,
+                    app.state.redis,
+                    lock_timeout=settings.cache_warmup_lock_seconds,
+                )
+            )
         app.state.auth_client = AuthServiceClient(
             str(settings.auth_service_url),
             introspection_path=settings.auth_service_introspection_path,
@@ -32,16 +92,76 @@ def create_app() -> FastAPI:
             timeout=settings.auth_service_timeout,
             max_retries=settings.auth_service_max_retries,
             backoff_factor=settings.auth_service_backoff_factor,
+            max_connections=settings.auth_service_max_connections,
+            max_keepalive_connections=settings.auth_service_max_keepalive_connections,
+            keepalive_expiry=settings.auth_service_keepalive_expiry,
+            http2=settings.auth_service_http2,
+            jwks_path=settings.auth_jwks_path,
+            breaker=(
+                CircuitBreaker(
+                    "auth",
+                    failure_rate_threshold=settings.auth_breaker_failure_rate,
+                    minimum_calls=settings.auth_breaker_minimum_calls,
+                    window_size=settings.auth_breaker_window_size,
+                    open_seconds=settings.auth_breaker_open_seconds,
+                    half_open_max_calls=settings.auth_breaker_half_open_calls,
+                )
+                if settings.auth_breaker_enabled
+                else None
+            ),
+            adaptive_timeout=(
+                AdaptiveTimeout(
+                    minimum=settings.auth_adaptive_timeout_min,
+                    maximum=settings.auth_service_timeout,
+                    multiplier=settings.auth_adaptive_timeout_multiplier,
+                )
+                if settings.auth_adaptive_timeout_enabled
+                else None
+            ),
+        )
+        # Every entry is one small payload, so the byte budget is the count.
+        app.state.auth_token_cache = (
+            LocalCache(
+                max_entries=settings.auth_local_cache_max_entries,
+                max_bytes=settings.auth_local_cache_max_entries,
+                ttl=settings.auth_local_cache_ttl_seconds,
+            )
+            if settings.auth_local_cache_ttl_seconds > 0
+            else None
+        )
+        app.state.auth_flight = SingleFlight()
+        app.state.jwt_verifier = (
+            JwtVerifier(
+                app.state.auth_client,
+                algorithms=settings.auth_jwt_algorithms,
+                public_key=settings.auth_jwt_public_key,
+                audience=settings.auth_jwt_audience,
+                issuer=settings.auth_jwt_issuer,
+                leeway=settings.auth_jwt_leeway_seconds,
+                jwks_refresh_seconds=settings.auth_jwks_refresh_seconds,
+                revocation_check_seconds=settings.auth_revocation_check_seconds,
+            )
+            if settings.auth_jwt_local_enabled
+            else None
         )
 
     @app.on_event("shutdown")
     async def shutdown() -> None:
+        for name in ("warmup_task", "invalidation_task"):
+            task: asyncio.Task | None = getattr(app.state, name, None)
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
         elastic: AsyncElasticsearch | None = getattr(app.state, "elastic", None)
         if elastic is not None:
             await elastic.close()
         redis: Redis | None = getattr(app.state, "redis", None)
         if redis is not None:
             await redis.close()
+        jwt_verifier: JwtVerifier | None = getattr(app.state, "jwt_verifier", None)
+        if jwt_verifier is not None:
+            await jwt_verifier.close()
         auth_client: AuthServiceClient | None = getattr(app.state, "auth_client", None)
         if auth_client is not None:
             await auth_client.close()
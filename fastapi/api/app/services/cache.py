@@ -1,31 +1,416 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
-from typing import Any
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Sequence
 
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from .codecs import CacheCodec, CacheCodecError, CacheEntry, dumps, loads
+from .local_cache import CacheStats, LocalCache
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Tag index: a sorted set per tag, members are cache keys scored by their
+# hard expiry. Expired members are pruned on every write, so a set only
+# holds keys that may still exist.
+_TAG_PREFIX = "cache:tags:"
+_PURGE_BATCH = 500
+_background_tasks: set[asyncio.Task[Any]] = set()
+
+
+@dataclass(frozen=True)
+class WithHeaders:
+    """Loader result whose response headers are cached together with it."""
+
+    value: Any
+    headers: Mapping[str, str] = field(default_factory=dict)
 
 
 class CacheService:
-    def __init__(self, redis: Redis, ttl: int) -> None:
+    """Redis-backed response cache with an optional in-process tier.
+
+    Values are stored as the final JSON response body, encoded by
+    ``CacheCodec`` (versioned header, soft expiry, optional compression).
+    Entries carry a soft expiry (``ttl``) and a hard one (``ttl + stale_ttl``).
+    Between the two ``get_or_set`` still serves the cached value and refreshes
+    it in the background. A loader returning ``None`` can be remembered as a
+    negative entry for ``negative_ttl`` seconds, a ``WithHeaders`` result is
+    stored together with its response headers. Keys may be tagged (``films``, ``films:<id>``...)
+    so that ``invalidate_tags`` can drop every response built from a document.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int,
+        *,
+        stale_ttl: int = 0,
+        codec: CacheCodec | None = None,
+        local: LocalCache | None = None,
+        stats: CacheStats | None = None,
+        flight: SingleFlight | None = None,
+    ) -> None:
         self._redis = redis
         self._ttl = ttl
+        self._stale_ttl = max(0, stale_ttl)
+        self._codec = codec if codec is not None else CacheCodec()
+        self._local = local
+        self._stats = stats if stats is not None else CacheStats()
+        self._flight = flight
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
 
     async def get(self, key: str) -> Any | None:
-        cached = await self._redis.get(key)
+        body = await self.get_raw(key)
+        if body is None:
+            return None
+        return loads(body)
+
+    async def get_raw(self, key: str) -> bytes | None:
+        entry = await self._get_entry(key)
+        if entry is None:
+            return None
+        return entry.body
+
+    async def get_many(self, keys: Sequence[str]) -> list[Any | None]:
+        """Decoded values for ``keys`` in order, fetched with a single MGET."""
+        return [
+            None if body is None else loads(body)
+            for body in await self.get_many_raw(keys)
+        ]
+
+    async def get_many_raw(self, keys: Sequence[str]) -> list[bytes | None]:
+        return [
+            None if entry is None else entry.body
+            for entry in await self.get_many_entries(keys)
+        ]
+
+    async def get_many_entries(self, keys: Sequence[str]) -> list[CacheEntry | None]:
+        """Entries for ``keys`` in order, ``None`` where nothing is cached.
+
+        Unlike ``get_many_raw`` this tells negative entries (``body`` is
+        ``None``) from misses.
+        """
+        entries: list[CacheEntry | None] = [
+            self._get_local(key) for key in keys
+        ]
+        missing = [index for index, entry in enumerate(entries) if entry is None]
+        if missing:
+            values = await self._redis.mget([keys[index] for index in missing])
+            for index, cached in zip(missing, values):
+                entries[index] = self._accept(keys[index], cached)
+        return entries
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        tags: Sequence[str] = (),
+        ttl: int | None = None,
+    ) -> None:
+        await self.set_raw(key, self.dumps(value), tags=tags, ttl=ttl)
+
+    async def set_raw(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        tags: Sequence[str] = (),
+        ttl: int | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        await self._store(
+            [(key, body, tags, headers)], ttl=self._ttl if ttl is None else ttl
+        )
+
+    async def set_many(
+        self,
+        values: Mapping[str, Any],
+        *,
+        tags: Mapping[str, Sequence[str]] | None = None,
+        ttl: int | None = None,
+    ) -> None:
+        """Store several values in one pipelined round trip."""
+        await self.set_many_raw(
+            {key: self.dumps(value) for key, value in values.items()},
+            tags=tags,
+            ttl=ttl,
+        )
+
+    async def set_many_raw(
+        self,
+        bodies: Mapping[str, bytes | None],
+        *,
+        tags: Mapping[str, Sequence[str]] | None = None,
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+    ) -> None:
+        """Store several bodies in one pipelined round trip.
+
+        ``None`` bodies become negative entries for ``negative_ttl`` seconds,
+        without it they are skipped.
+        """
+        tags = tags or {}
+        await self._store(
+            [
+                (key, body, tags.get(key, ()), None)
+                for key, body in bodies.items()
+                if body is not None or negative_ttl
+            ],
+            ttl=self._ttl if ttl is None else ttl,
+            negative_ttl=negative_ttl,
+        )
+
+    async def set_negative(
+        self,
+        key: str,
+        *,
+        ttl: int,
+        tags: Sequence[str] = (),
+    ) -> None:
+        await self._store([(key, None, tags, None)], ttl=ttl)
+
+    async def _store(
+        self,
+        entries: Sequence[
+            tuple[str, bytes | None, Sequence[str], Mapping[str, str] | None]
+        ],
+        *,
+        ttl: int,
+        negative_ttl: int | None = None,
+    ) -> None:
+        """Write ``entries`` for ``ttl`` seconds, negative ones (``body`` is
+        ``None``) for ``negative_ttl`` when it is given."""
+        if not entries:
+            return
+        now = time.time()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, body, tags, headers in entries:
+                entry_ttl = negative_ttl if body is None and negative_ttl else ttl
+                soft_expires_at = now + entry_ttl
+                hard_ttl = entry_ttl + self._stale_ttl
+                payload = self._codec.encode(body, soft_expires_at, headers)
+                pipe.set(key, payload, ex=hard_ttl)
+                for tag in tags:
+                    pipe.zadd(_TAG_PREFIX + tag, {key: now + hard_ttl})
+                    pipe.zremrangebyscore(_TAG_PREFIX + tag, "-inf", now)
+                    pipe.expire(_TAG_PREFIX + tag, hard_ttl, nx=True)
+                    pipe.expire(_TAG_PREFIX + tag, hard_ttl, gt=True)
+                if self._local is not None:
+                    self._local.set(
+                        key,
+                        CacheEntry(body, soft_expires_at, headers),
+                        size=len(body or b""),
+                        ttl=min(self._local.ttl, entry_ttl),
+                        tags=tags,
+                    )
+            await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Drop every entry stored under any of ``tags`` in both tiers."""
+        tags = list(tags)
+        if not tags:
+            return
+        if self._local is not None:
+            self._local.invalidate_tags(tags)
+        for tag in tags:
+            await self._purge_tag(_TAG_PREFIX + tag)
+
+    async def _purge_tag(self, tag_key: str) -> None:
+        """Delete the keys of one tag in batches, without blocking Redis.
+
+        The index is renamed first, so entries written meanwhile start a new
+        one and are not deleted together with the old ones.
+        """
+        purge_key = f"{tag_key}:purge:{uuid.uuid4().hex}"
+        try:
+            await self._redis.rename(tag_key, purge_key)
+        except ResponseError:
+            # No entries under this tag.
+            return
+        cursor = 0
+        while True:
+            cursor, members = await self._redis.zscan(
+                purge_key, cursor, count=_PURGE_BATCH
+            )
+            if members:
+                await self._redis.unlink(*(member for member, _ in members))
+            if not cursor:
+                break
+        await self._redis.unlink(purge_key)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any | None]],
+        *,
+        tags: Sequence[str] = (),
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+    ) -> bytes | None:
+        """Return the cached JSON body or load it, coalescing concurrent misses.
+
+        ``None`` returned by ``loader`` is passed through. It is cached as a
+        negative entry only when ``negative_ttl`` is given.
+        """
+        entry = await self.get_or_set_entry(
+            key, loader, tags=tags, ttl=ttl, negative_ttl=negative_ttl
+        )
+        return None if entry is None else entry.body
+
+    async def get_or_set_entry(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any | None]],
+        *,
+        tags: Sequence[str] = (),
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+    ) -> CacheEntry | None:
+        """Like ``get_or_set`` but keeps the headers of a ``WithHeaders`` value."""
+        load = partial(
+            self._load, key, loader, tags=tags, ttl=ttl, negative_ttl=negative_ttl
+        )
+        entry = await self._get_entry(key, tags)
+        if entry is not None:
+            if entry.body is None:
+                self._stats.negative_hits += 1
+            if entry.soft_expires_at <= time.time():
+                self._stats.stale_hits += 1
+                self._schedule_refresh(key, load, tags)
+            return None if entry.body is None else entry
+        if self._flight is None:
+            return await load()
+        entry = await self._flight.do(
+            key,
+            load,
+            recheck=partial(self._get_hit, key, tags),
+        )
+        return None if entry is None or entry.body is None else entry
+
+    async def _get_entry(
+        self,
+        key: str,
+        tags: Sequence[str] = (),
+    ) -> CacheEntry | None:
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry
+        return self._accept(key, await self._redis.get(key), tags)
+
+    def _get_local(self, key: str) -> CacheEntry | None:
+        if self._local is None:
+            return None
+        entry = self._local.get(key)
+        if entry is not None and entry.soft_expires_at > time.time():
+            self._stats.local_hits += 1
+            return entry
+        self._stats.local_misses += 1
+        return None
+
+    def _accept(
+        self,
+        key: str,
+        cached: bytes | None,
+        tags: Sequence[str] = (),
+    ) -> CacheEntry | None:
         if cached is None:
+            self._stats.redis_misses += 1
             return None
-        if isinstance(cached, bytes):
-            cached = cached.decode("utf-8")
-        return json.loads(cached)
+        try:
+            entry = self._codec.decode(cached)
+        except CacheCodecError as exc:
+            logger.warning("Unreadable cache entry %s: %s", key, exc)
+            self._stats.redis_misses += 1
+            return None
+        self._stats.redis_hits += 1
+        if self._local is not None and entry.soft_expires_at > time.time():
+            self._local.set(
+                key,
+                entry,
+                size=len(entry.body or b""),
+                ttl=self._local_ttl(),
+                tags=tags,
+            )
+        return entry
+
+    async def _get_hit(self, key: str, tags: Sequence[str]) -> CacheEntry | None:
+        """Whatever another loader cached meanwhile, negative entries included."""
+        entry = await self._get_entry(key, tags)
+        if entry is not None and entry.body is None:
+            self._stats.negative_hits += 1
+        return entry
+
+    async def _get_fresh(self, key: str, tags: Sequence[str]) -> CacheEntry | None:
+        entry = await self._get_entry(key, tags)
+        if entry is None or entry.soft_expires_at <= time.time():
+            return None
+        return entry
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any | None]],
+        *,
+        tags: Sequence[str] = (),
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+    ) -> CacheEntry | None:
+        value = await loader()
+        headers = None
+        if isinstance(value, WithHeaders):
+            value, headers = value.value, value.headers
+        if value is None:
+            if negative_ttl:
+                await self.set_negative(key, ttl=negative_ttl, tags=tags)
+            return None
+        body = self.dumps(value)
+        await self.set_raw(key, body, tags=tags, ttl=ttl, headers=headers)
+        return CacheEntry(body, time.time() + (self._ttl if ttl is None else ttl), headers)
 
-    async def set(self, key: str, value: Any) -> None:
-        payload = json.dumps(value, ensure_ascii=False)
-        await self._redis.set(key, payload, ex=self._ttl)
+    def _schedule_refresh(
+        self,
+        key: str,
+        refresh: Callable[[], Awaitable[CacheEntry | None]],
+        tags: Sequence[str],
+    ) -> None:
+        if self._flight is None:
+            coro = refresh()
+        else:
+            coro = self._flight.do(key, refresh, recheck=partial(self._get_fresh, key, tags))
+        task = asyncio.create_task(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_on_refresh_done)
+
+    def _local_ttl(self) -> float:
+        assert self._local is not None
+        return min(self._local.ttl, self._ttl)
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        """Encode ``value`` exactly like ``JSONResponse`` renders it."""
+        return dumps(value)
 
     @staticmethod
     def build_key(namespace: str, data: Any) -> str:
         raw = json.dumps(data, ensure_ascii=False, sort_keys=True)
         digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
         return f"{namespace}:{digest}"
+
+
+def _on_refresh_done(task: asyncio.Task[Any]) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background cache refresh failed: %s", task.exception())
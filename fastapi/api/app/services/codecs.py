@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import math
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, NamedTuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Header byte, high nibble is the format version.
+#   v0: 0x01 - zlib body, 0x02 - negative entry (written by older workers)
+#   v1: 0x08 - negative entry, 0x07 - compressor id (see COMPRESSORS)
+#   v2: as v1, the body is preceded by length-prefixed JSON response headers
+_HEADER = struct.Struct(">Bd")
+_HEADERS_LENGTH = struct.Struct(">H")
+_VERSION = 1
+_VERSION_WITH_HEADERS = 2
+_V0_COMPRESSED = 0x01
+_V0_NEGATIVE = 0x02
+_NEGATIVE = 0x08
+_COMPRESSOR_MASK = 0x07
+_SOFT_EXPIRY_KEY = "__soft_expires_at__"
+
+
+class CacheCodecError(ValueError):
+    """Cached payload written in a format this worker cannot read."""
+
+
+class CacheEntry(NamedTuple):
+    body: bytes | None
+    soft_expires_at: float
+    headers: Mapping[str, str] | None = None
+
+
+@dataclass(frozen=True)
+class Compressor:
+    name: str
+    id: int
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+COMPRESSORS: dict[str, Compressor] = {
+    "zlib": Compressor("zlib", 1, zlib.compress, zlib.decompress),
+}
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = Compressor("lz4", 2, lz4_frame.compress, lz4_frame.decompress)
+if zstandard is not None:
+    COMPRESSORS["zstd"] = Compressor("zstd", 3, _zstd_compress, _zstd_decompress)
+_COMPRESSORS_BY_ID = {compressor.id: compressor for compressor in COMPRESSORS.values()}
+
+
+def dumps(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON, the way ``JSONResponse`` does."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def loads(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class CacheCodec:
+    """Wire format of cache entries: header byte, soft expiry, body and
+    optionally the response headers that go with it.
+
+    Bodies of at least ``min_bytes`` are compressed with ``compression``
+    (``zlib``, ``lz4`` or ``zstd``; ``none`` or ``min_bytes=0`` disables it).
+    Every known version is readable regardless of the configured compressor,
+    as long as the library that wrote the entry is installed.
+    """
+
+    def __init__(self, compression: str = "zlib", *, min_bytes: int = 0) -> None:
+        if compression == "none":
+            self._compressor = None
+        elif compression in COMPRESSORS:
+            self._compressor = COMPRESSORS[compression]
+        else:
+            raise ValueError(
+                f"Unsupported cache compression {compression!r}, "
+                f"available: none, {', '.join(COMPRESSORS)}"
+            )
+        self._min_bytes = max(0, min_bytes)
+
+    def encode(
+        self,
+        body: bytes | None,
+        soft_expires_at: float,
+        headers: Mapping[str, str] | None = None,
+    ) -> bytes:
+        header = _VERSION << 4
+        payload = body or b""
+        if body is None:
+            header |= _NEGATIVE
+        elif self._compressor is not None and self._min_bytes and len(body) >= self._min_bytes:
+            header |= self._compressor.id
+            payload = self._compressor.compress(body)
+        if headers and body is not None:
+            header = _VERSION_WITH_HEADERS << 4 | header & 0x0F
+            encoded = dumps(dict(headers))
+            payload = _HEADERS_LENGTH.pack(len(encoded)) + encoded + payload
+        return _HEADER.pack(header, soft_expires_at) + payload
+
+    def decode(self, cached: bytes) -> CacheEntry:
+        """Entry stored in ``cached``.
+
+        Raises ``CacheCodecError`` for anything unreadable: unknown versions,
+        truncated headers, corrupt compressed bodies or headers.
+        """
+        try:
+            return self._decode(cached)
+        except CacheCodecError:
+            raise
+        except Exception as exc:
+            # struct.error, zlib.error, zstd/lz4 and JSON errors share no base.
+            raise CacheCodecError(f"corrupt cache entry: {exc!r}") from exc
+
+    def _decode(self, cached: bytes) -> CacheEntry:
+        if cached[:1] in (b"{", b"["):
+            # Entries written before bodies were cached as raw bytes.
+            data = json.loads(cached)
+            if isinstance(data, dict) and _SOFT_EXPIRY_KEY in data:
+                return CacheEntry(dumps(data["value"]), data[_SOFT_EXPIRY_KEY])
+            return CacheEntry(dumps(data), math.inf)
+        header, soft_expires_at = _HEADER.unpack_from(cached)
+        body = cached[_HEADER.size:]
+        version = header >> 4
+        if version == 0:
+            if header & _V0_NEGATIVE:
+                return CacheEntry(None, soft_expires_at)
+            if header & _V0_COMPRESSED:
+                body = zlib.decompress(body)
+            return CacheEntry(body, soft_expires_at)
+        if version not in (_VERSION, _VERSION_WITH_HEADERS):
+            raise CacheCodecError(f"unknown cache entry version {version}")
+        if header & _NEGATIVE:
+            return CacheEntry(None, soft_expires_at)
+        headers = None
+        if version == _VERSION_WITH_HEADERS:
+            (length,) = _HEADERS_LENGTH.unpack_from(body)
+            start = _HEADERS_LENGTH.size
+            headers = loads(body[start:start + length])
+            if not isinstance(headers, dict):
+                raise CacheCodecError("cached response headers are not an object")
+            body = body[start + length:]
+        compressor_id = header & _COMPRESSOR_MASK
+        if compressor_id:
+            compressor = _COMPRESSORS_BY_ID.get(compressor_id)
+            if compressor is None:
+                raise CacheCodecError(f"compressor {compressor_id} is not installed")
+            body = compressor.decompress(body)
+        return CacheEntry(body, soft_expires_at, headers)
@@ -1,22 +1,83 @@
 from __future__ import annotations
 
-from typing import Any, Iterable
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
 
 from elasticsearch import AsyncElasticsearch, NotFoundError
 
+logger = logging.getLogger(__name__)
+
+# Unique last sort key, so that every hit has a stable position for search_after.
+TIEBREAKER_SORT = {"id": {"order": "asc"}}
+# Only the parts of the search response the services read.
+SEARCH_FILTER_PATH = ["hits.hits._source", "hits.hits.sort"]
+# Bucket keys and counts of every aggregation on top of the hits.
+AGGREGATIONS_FILTER_PATH = [
+    *SEARCH_FILTER_PATH,
+    "aggregations.*.buckets.key",
+    "aggregations.*.buckets.doc_count",
+]
+
+
+@dataclass
+class SearchPage:
+    items: list[dict[str, Any]]
+    # Sort values of the last hit of a full page, the next page starts after it.
+    search_after: list[Any] | None = None
+    # Facet counts, only when they were requested.
+    facets: dict[str, Any] | None = None
+
 
 class ElasticService:
-    def __init__(self, elastic: AsyncElasticsearch, index: str) -> None:
+    def __init__(
+        self,
+        elastic: AsyncElasticsearch,
+        index: str,
+        *,
+        detail_timeout: float | None = None,
+        search_timeout: float | None = None,
+    ) -> None:
         self.elastic = elastic
         self.index = index
+        # Lookups by id are cheap, they get a shorter budget than searches.
+        self.detail_timeout = detail_timeout
+        self.search_timeout = search_timeout
+
+    def _client(self, request_timeout: float | None) -> AsyncElasticsearch:
+        if request_timeout is None:
+            return self.elastic
+        return self.elastic.options(request_timeout=request_timeout)
 
-    async def get_by_id(self, doc_id: str) -> dict[str, Any] | None:
+    async def get_by_id(
+        self,
+        doc_id: str,
+        *,
+        source: Iterable[str] | None = None,
+    ) -> dict[str, Any] | None:
+        kwargs: dict[str, Any] = {}
+        if source is not None:
+            kwargs["source_includes"] = list(source)
         try:
-            document = await self.elastic.get(index=self.index, id=doc_id)
+            document = await self._client(self.detail_timeout).get(
+                index=self.index, id=doc_id, **kwargs
+            )
         except NotFoundError:
             return None
         return document.get("_source")
 
+    async def get_many(self, doc_ids: list[str]) -> list[dict[str, Any] | None]:
+        """Documents for ``doc_ids`` in order, one ``_mget`` round trip."""
+        if not doc_ids:
+            return []
+        response = await self._client(self.detail_timeout).mget(
+            index=self.index, ids=doc_ids
+        )
+        return [
+            document.get("_source") if document.get("found") else None
+            for document in response.get("docs", [])
+        ]
+
     async def search(
         self,
         query: dict[str, Any],
@@ -24,14 +85,124 @@ class ElasticService:
         size: int,
         offset: int,
         sort: Iterable[dict[str, Any]] | None = None,
+        search_after: list[Any] | None = None,
+        source: Iterable[str] | None = None,
+        filter_path: Iterable[str] = SEARCH_FILTER_PATH,
+        request_cache: bool | None = None,
+        track_total_hits: bool | None = None,
+        aggs: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
+        """Run a search, ``source`` limits ``_source`` to the given fields.
+
+        ``request_cache=True`` lets the shards cache the whole response, also
+        for ``size > 0``. Use it for queries that repeat verbatim.
+        """
         body = {"query": query}
+        if source is not None:
+            body["_source"] = {"includes": list(source)}
         if sort:
             body["sort"] = list(sort)
-        response = await self.elastic.search(
+        if search_after is not None:
+            body["search_after"] = search_after
+            offset = 0
+        if track_total_hits is not None:
+            body["track_total_hits"] = track_total_hits
+        if aggs:
+            body["aggs"] = aggs
+        response = await self._client(self.search_timeout).search(
             index=self.index,
             body=body,
             size=size,
             from_=offset,
+            filter_path=list(filter_path),
+            request_cache=request_cache,
         )
         return response
+
+    async def suggest(
+        self,
+        field: str,
+        query: str,
+        *,
+        size: int,
+        source: Iterable[str],
+    ) -> list[dict[str, Any]]:
+        """Documents whose ``search_as_you_type`` ``field`` starts with
+        ``query``, the last word is matched as a prefix."""
+        response = await self.search(
+            query={
+                "multi_match": {
+                    "query": query,
+                    "type": "bool_prefix",
+                    "fields": [field, f"{field}._2gram", f"{field}._3gram"],
+                }
+            },
+            size=size,
+            offset=0,
+            source=source,
+            filter_path=["hits.hits._source"],
+            request_cache=True,
+            track_total_hits=False,
+        )
+        return [hit["_source"] for hit in response.get("hits", {}).get("hits", [])]
+
+    async def search_template(
+        self,
+        template_id: str,
+        params: Mapping[str, Any],
+        *,
+        filter_path: Iterable[str] = SEARCH_FILTER_PATH,
+        request_cache: bool | None = None,
+        source: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Run the stored search template ``template_id`` with ``params``.
+
+        With ``source`` a template missing from the cluster (not stored at
+        startup, or lost with the cluster state) is stored again and the
+        search retried once.
+        """
+        try:
+            return await self._search_template(
+                template_id, params, filter_path=filter_path, request_cache=request_cache
+            )
+        except NotFoundError as exc:
+            if source is None or "unable to find script" not in str(exc):
+                raise
+        logger.warning("Search template %s is missing, storing it again", template_id)
+        await self.elastic.put_script(
+            id=template_id, script={"lang": "mustache", "source": dict(source)}
+        )
+        return await self._search_template(
+            template_id, params, filter_path=filter_path, request_cache=request_cache
+        )
+
+    async def _search_template(
+        self,
+        template_id: str,
+        params: Mapping[str, Any],
+        *,
+        filter_path: Iterable[str],
+        request_cache: bool | None,
+    ) -> dict[str, Any]:
+        query: dict[str, Any] = {"filter_path": list(filter_path)}
+        if request_cache is not None:
+            # search_template() of the client has no request_cache argument,
+            # the endpoint itself accepts it.
+            query["request_cache"] = request_cache
+        response = await self._client(self.search_timeout).perform_request(
+            "POST",
+            f"/{self.index}/_search/template",
+            params=query,
+            headers={"accept": "application/json", "content-type": "application/json"},
+            body={"id": template_id, "params": dict(params)},
+            endpoint_id="search_template",
+            path_parts={"index": self.index},
+        )
+        return response.body
+
+    @staticmethod
+    def next_search_after(hits: list[dict[str, Any]], size: int) -> list[Any] | None:
+        if not hits or len(hits) < size:
+            return None
+        return hits[-1].get("sort")
+
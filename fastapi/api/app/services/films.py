@@ -1,17 +1,91 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Sequence
 
 from elasticsearch import AsyncElasticsearch
 
 from ..core.config import Settings
-from ..db.serializers.film import FilmDetailSerializer, FilmShortSerializer
-from .elastic import ElasticService
+from ..db.serializers.film import (
+    FilmDetailSerializer,
+    FilmFacetsSerializer,
+    FilmShortSerializer,
+    FilmSuggestSerializer,
+    FilmWithPersonsSerializer,
+)
+from .elastic import (
+    AGGREGATIONS_FILTER_PATH,
+    SEARCH_FILTER_PATH,
+    TIEBREAKER_SORT,
+    ElasticService,
+    SearchPage,
+)
+
+
+# Fields of FilmShortSerializer, enough for every list and search response.
+FILM_SHORT_FIELDS = ("id", "title", "imdb_rating")
+# Flat keyword copies of the nested genre and people ids, filtering on them
+# avoids nested queries.
+GENRE_IDS_FIELD = "genre_ids"
+PERSON_ROLE_FIELDS = {
+    None: "person_ids",
+    "actor": "actor_ids",
+    "writer": "writer_ids",
+    "director": "director_ids",
+}
+# People lists of a film document and the role each of them stands for.
+FILM_PERSON_ROLES = {"actors": "actor", "writers": "writer", "directors": "director"}
+FILMS_SEARCH_TEMPLATE_ID = "films-search"
+FILM_SEARCH_FIELDS = ["title^2", "description", "actors_names", "writers_names"]
+# Stored as a mustache template, requests only carry the parameters.
+FILMS_SEARCH_TEMPLATE = {
+    "query": {
+        "bool": {
+            "should": [
+                {
+                    "multi_match": {
+                        "query": "{{query}}",
+                        "fields": FILM_SEARCH_FIELDS,
+                        "fuzziness": "auto",
+                    }
+                },
+                {
+                    "multi_match": {
+                        "query": "{{query}}",
+                        "fields": FILM_SEARCH_FIELDS,
+                        "type": "phrase_prefix",
+                    }
+                },
+            ],
+            "minimum_should_match": 1,
+        }
+    },
+    "_source": {"includes": list(FILM_SHORT_FIELDS)},
+    "from": "{{from}}",
+    "size": "{{size}}",
+}
+FILM_FACET_AGGS = {
+    "genres": {"terms": {"field": "genre_names", "size": 100}},
+    "rating": {
+        "histogram": {
+            "field": "imdb_rating",
+            "interval": 1,
+            "min_doc_count": 0,
+            "extended_bounds": {"min": 0, "max": 10},
+        }
+    },
+}
+FILMS_FACETED_SEARCH_TEMPLATE_ID = "films-search-facets"
+FILMS_FACETED_SEARCH_TEMPLATE = {**FILMS_SEARCH_TEMPLATE, "aggs": FILM_FACET_AGGS}
 
 
 class FilmService(ElasticService):
     def __init__(self, elastic: AsyncElasticsearch, settings: Settings) -> None:
-        super().__init__(elastic=elastic, index=settings.es_movies_index)
+        super().__init__(
+            elastic=elastic,
+            index=settings.es_movies_index,
+            detail_timeout=settings.es_detail_timeout,
+            search_timeout=settings.es_search_timeout,
+        )
 
     async def get_film(self, film_id: str) -> dict[str, Any] | None:
         document = await self.get_by_id(film_id)
@@ -20,40 +94,98 @@ class FilmService(ElasticService):
         payload = FilmDetailSerializer(**document)
         return payload.model_dump(by_alias=True)
 
+    async def film_participants(self, film_id: str) -> dict[str, Any] | None:
+        """Film with its people and their roles, from the film document alone."""
+        document = await self.get_by_id(
+            film_id, source=(*FILM_SHORT_FIELDS, *FILM_PERSON_ROLES)
+        )
+        if document is None:
+            return None
+        persons: dict[str, dict[str, Any]] = {}
+        for field, role in FILM_PERSON_ROLES.items():
+            for person in document.get(field) or []:
+                entry = persons.setdefault(
+                    person["id"],
+                    {"id": person["id"], "full_name": person["name"], "roles": []},
+                )
+                entry["roles"].append(role)
+        payload = FilmWithPersonsSerializer(
+            **document,
+            persons=sorted(persons.values(), key=lambda person: person["full_name"]),
+        )
+        return payload.model_dump(by_alias=True)
+
+    async def get_films(self, film_ids: list[str]) -> list[dict[str, Any] | None]:
+        documents = await self.get_many(film_ids)
+        return [
+            None if document is None
+            else FilmDetailSerializer(**document).model_dump(by_alias=True)
+            for document in documents
+        ]
+
     async def list_films(
         self,
         *,
         page_size: int,
         page_number: int,
-        genre: str | None = None,
+        genres: Sequence[str] | None = None,
+        genre_mode: str = "any",
+        person: str | None = None,
+        role: str | None = None,
         sort: str | None = None,
-    ) -> list[dict[str, Any]]:
+        search_after: list[Any] | None = None,
+        facets: bool = False,
+    ) -> SearchPage:
         offset = (page_number - 1) * page_size
         query: dict[str, Any]
         filters: list[dict[str, Any]] = []
-        if genre:
-            filters.append(
-                {
-                    "nested": {
-                        "path": "genres",
-                        "query": {"term": {"genres.id": genre}},
-                    }
-                }
-            )
+        if genres:
+            # "all" needs one clause per genre, "any" is a single terms lookup.
+            if genre_mode == "all":
+                filters.extend({"terms": {GENRE_IDS_FIELD: [genre]}} for genre in genres)
+            else:
+                filters.append({"terms": {GENRE_IDS_FIELD: list(genres)}})
+        if person:
+            filters.append({"terms": {PERSON_ROLE_FIELDS[role]: [person]}})
         if filters:
             query = {"bool": {"filter": filters}}
         else:
             query = {"match_all": {}}
 
-        sort_clause = self._build_sort(sort)
+        sort_clause = [*(self._build_sort(sort) or []), TIEBREAKER_SORT]
         response = await self.search(
             query=query,
             size=page_size,
             offset=offset,
             sort=sort_clause,
+            search_after=search_after,
+            source=FILM_SHORT_FIELDS,
+            request_cache=True,
+            aggs=FILM_FACET_AGGS if facets else None,
+            filter_path=AGGREGATIONS_FILTER_PATH if facets else SEARCH_FILTER_PATH,
         )
         hits = response.get("hits", {}).get("hits", [])
-        return [FilmShortSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits]
+        return SearchPage(
+            items=[
+                FilmShortSerializer(**hit["_source"]).model_dump(by_alias=True)
+                for hit in hits
+            ],
+            search_after=self.next_search_after(hits, page_size),
+            facets=self._parse_facets(response) if facets else None,
+        )
+
+    async def film_facets(self) -> dict[str, Any]:
+        """Facet counts over the whole index."""
+        response = await self.search(
+            query={"match_all": {}},
+            size=0,
+            offset=0,
+            aggs=FILM_FACET_AGGS,
+            filter_path=AGGREGATIONS_FILTER_PATH,
+            request_cache=True,
+            track_total_hits=False,
+        )
+        return self._parse_facets(response)
 
     async def search_films(
         self,
@@ -61,67 +193,47 @@ class FilmService(ElasticService):
         query: str,
         page_size: int,
         page_number: int,
-    ) -> list[dict[str, Any]]:
+        facets: bool = False,
+    ) -> SearchPage:
         offset = (page_number - 1) * page_size
-        full_text_match = {
-            "multi_match": {
-                "query": query,
-                "fields": [
-                    "title^2",
-                    "description",
-                    "actors_names",
-                    "writers_names",
-                ],
-                "fuzziness": "auto",
-            }
-        }
-        prefix_match = {
-            "multi_match": {
-                "query": query,
-                "fields": [
-                    "title^2",
-                    "description",
-                    "actors_names",
-                    "writers_names",
-                ],
-                "type": "phrase_prefix",
-            }
-        }
-        search_query = {
-            "bool": {
-                "should": [full_text_match, prefix_match],
-                "minimum_should_match": 1,
-            }
-        }
-        response = await self.search(query=search_query, size=page_size, offset=offset)
+        response = await self.search_template(
+            FILMS_FACETED_SEARCH_TEMPLATE_ID if facets else FILMS_SEARCH_TEMPLATE_ID,
+            {"query": query, "from": offset, "size": page_size},
+            filter_path=AGGREGATIONS_FILTER_PATH if facets else SEARCH_FILTER_PATH,
+            request_cache=True,
+            source=FILMS_FACETED_SEARCH_TEMPLATE if facets else FILMS_SEARCH_TEMPLATE,
+        )
         hits = response.get("hits", {}).get("hits", [])
-        return [FilmShortSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits]
+        return SearchPage(
+            items=[
+                FilmShortSerializer(**hit["_source"]).model_dump(by_alias=True)
+                for hit in hits
+            ],
+            facets=self._parse_facets(response) if facets else None,
+        )
 
-    async def films_by_person(
-        self,
-        person_id: str,
-        *,
-        page_size: int,
-        page_number: int,
-    ) -> list[dict[str, Any]]:
-        offset = (page_number - 1) * page_size
-        query = {
-            "bool": {
-                "should": [
-                    {
-                        "nested": {
-                            "path": path,
-                            "query": {"term": {f"{path}.id": person_id}},
-                        }
-                    }
-                    for path in ("actors", "writers", "directors")
-                ],
-                "minimum_should_match": 1,
-            }
-        }
-        response = await self.search(query=query, size=page_size, offset=offset)
-        hits = response.get("hits", {}).get("hits", [])
-        return [FilmShortSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits]
+    async def suggest_films(self, query: str, *, size: int) -> list[dict[str, Any]]:
+        documents = await self.suggest(
+            "title_suggest", query, size=size, source=("id", "title")
+        )
+        return [
+            FilmSuggestSerializer(**document).model_dump(by_alias=True)
+            for document in documents
+        ]
+
+    @staticmethod
+    def _parse_facets(response: dict[str, Any]) -> dict[str, Any]:
+        aggregations = response.get("aggregations", {})
+        return FilmFacetsSerializer(
+            genres=[
+                {"name": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in aggregations.get("genres", {}).get("buckets", [])
+            ],
+            rating=[
+                {"rating": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in aggregations.get("rating", {}).get("buckets", [])
+            ],
+        ).model_dump()
 
     @staticmethod
     def _build_sort(sort: str | None) -> list[dict[str, Any]] | None:
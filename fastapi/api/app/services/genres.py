@@ -6,12 +6,20 @@ from elasticsearch import AsyncElasticsearch
 
 from ..core.config import Settings
 from ..db.serializers.genre import GenreSerializer
-from .elastic import ElasticService
+from .elastic import TIEBREAKER_SORT, ElasticService, SearchPage
+
+
+GENRE_FIELDS = ("id", "name", "description")
 
 
 class GenreService(ElasticService):
     def __init__(self, elastic: AsyncElasticsearch, settings: Settings) -> None:
-        super().__init__(elastic=elastic, index=settings.es_genres_index)
+        super().__init__(
+            elastic=elastic,
+            index=settings.es_genres_index,
+            detail_timeout=settings.es_detail_timeout,
+            search_timeout=settings.es_search_timeout,
+        )
 
     async def get_genre(self, genre_id: str) -> dict[str, Any] | None:
         document = await self.get_by_id(genre_id)
@@ -25,13 +33,25 @@ class GenreService(ElasticService):
         page_size: int,
         page_number: int,
         sort: str | None = None,
-    ) -> list[dict[str, Any]]:
+        search_after: list[Any] | None = None,
+    ) -> SearchPage:
         offset = (page_number - 1) * page_size
         query: dict[str, Any] = {"match_all": {}}
-        sort_clause = self._build_sort(sort)
-        response = await self.search(query=query, size=page_size, offset=offset, sort=sort_clause)
+        sort_clause = [*(self._build_sort(sort) or []), TIEBREAKER_SORT]
+        response = await self.search(
+            query=query,
+            size=page_size,
+            offset=offset,
+            sort=sort_clause,
+            search_after=search_after,
+            source=GENRE_FIELDS,
+            request_cache=True,
+        )
         hits = response.get("hits", {}).get("hits", [])
-        return [GenreSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits]
+        return SearchPage(
+            items=[GenreSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits],
+            search_after=self.next_search_after(hits, page_size),
+        )
 
     @staticmethod
     def _build_sort(sort: str | None) -> list[dict[str, Any]] | None:
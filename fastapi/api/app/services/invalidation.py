@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Iterable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+ENTITIES = frozenset({"films", "genres", "persons"})
+
+
+def invalidation_tags(entity: str, ids: Iterable[str]) -> list[str]:
+    """Tags to drop when documents of ``entity`` change.
+
+    The bare entity tag covers list and search pages, ``<entity>:<id>`` covers
+    everything built from a single document.
+    """
+    return [entity, *(f"{entity}:{doc_id}" for doc_id in ids)]
+
+
+class CacheInvalidationListener:
+    """Consume ETL change events from Redis pub/sub and drop affected keys.
+
+    Every worker runs its own listener so that its in-process tier is cleared
+    as well; the Redis part of the invalidation is idempotent.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        cache: CacheService,
+        *,
+        channel: str,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self._redis = redis
+        self._cache = cache
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        await self.handle(message["data"])
+            except RedisError as exc:
+                logger.warning("Cache invalidation listener error: %s", exc)
+                await asyncio.sleep(self._reconnect_delay)
+
+    async def handle(self, data: Any) -> None:
+        try:
+            event = json.loads(data)
+            entity = event["entity"]
+            ids = [str(doc_id) for doc_id in event.get("ids", [])]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed cache invalidation event: %r", data)
+            return
+        if entity not in ENTITIES:
+            logger.warning("Unknown entity in cache invalidation event: %s", entity)
+            return
+        await self._cache.invalidate_tags(invalidation_tags(entity, ids))
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable
+
+
+@dataclass
+class CacheStats:
+    """Per-worker hit/miss counters for both cache tiers."""
+
+    local_hits: int = 0
+    local_misses: int = 0
+    redis_hits: int = 0
+    redis_misses: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LocalCache:
+    """In-process LRU cache bounded by entry count and payload size.
+
+    Values are kept ready to be sent, so a hit costs neither a network round
+    trip nor decoding. ``size`` is only used for the byte budget. Entries may
+    carry tags so that a whole group can be dropped with ``invalidate_tags``.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int, ttl: float) -> None:
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = max(1, max_bytes)
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, int, Any, tuple[str, ...]]] = (
+            OrderedDict()
+        )
+        self._tags: dict[str, set[str]] = {}
+        self._bytes = 0
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        size: int,
+        ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        self.delete(key)
+        if size > self._max_bytes:
+            return
+        expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        entry_tags = tuple(tags)
+        self._entries[key] = (expires_at, size, value, entry_tags)
+        for tag in entry_tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self._bytes += size
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._drop(key, entry)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, set()):
+                self.delete(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._bytes = 0
+
+    def info(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+        }
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self._drop(key, entry)
+
+    def _drop(self, key: str, entry: tuple[float, int, Any, tuple[str, ...]]) -> None:
+        self._bytes -= entry[1]
+        for tag in entry[3]:
+            keys = self._tags.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
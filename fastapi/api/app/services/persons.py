@@ -5,13 +5,41 @@ from typing import Any
 from elasticsearch import AsyncElasticsearch
 
 from ..core.config import Settings
-from ..db.serializers.person import PersonDetailSerializer
-from .elastic import ElasticService
+from ..db.serializers.film import FilmShortSerializer
+from ..db.serializers.person import PersonDetailSerializer, PersonShortSerializer
+from .elastic import SEARCH_FILTER_PATH, TIEBREAKER_SORT, ElasticService, SearchPage
+
+
+PERSON_FIELDS = ("id", "full_name", "films.id", "films.roles")
+PERSONS_SEARCH_TEMPLATE_ID = "persons-search"
+PERSONS_SEARCH_TEMPLATE = {
+    "query": {
+        "bool": {
+            "must": [
+                {
+                    "multi_match": {
+                        "query": "{{query}}",
+                        "fields": ["full_name^2"],
+                        "fuzziness": "auto",
+                    }
+                }
+            ]
+        }
+    },
+    "_source": {"includes": list(PERSON_FIELDS)},
+    "from": "{{from}}",
+    "size": "{{size}}",
+}
 
 
 class PersonService(ElasticService):
     def __init__(self, elastic: AsyncElasticsearch, settings: Settings) -> None:
-        super().__init__(elastic=elastic, index=settings.es_persons_index)
+        super().__init__(
+            elastic=elastic,
+            index=settings.es_persons_index,
+            detail_timeout=settings.es_detail_timeout,
+            search_timeout=settings.es_search_timeout,
+        )
 
     async def get_person(self, person_id: str) -> dict[str, Any] | None:
         document = await self.get_by_id(person_id)
@@ -25,18 +53,28 @@ class PersonService(ElasticService):
         page_size: int,
         page_number: int,
         sort: str | None = None,
-    ) -> list[dict[str, Any]]:
+        search_after: list[Any] | None = None,
+    ) -> SearchPage:
         offset = (page_number - 1) * page_size
         query: dict[str, Any] = {"match_all": {}}
-        sort_clause = self._build_sort(sort)
+        sort_clause = [*(self._build_sort(sort) or []), TIEBREAKER_SORT]
         response = await self.search(
             query=query, 
             size=page_size, 
             offset=offset, 
-            sort=sort_clause
+            sort=sort_clause,
+            search_after=search_after,
+            source=PERSON_FIELDS,
+            request_cache=True,
             )
         hits = response.get("hits", {}).get("hits", [])
-        return [PersonDetailSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits]
+        return SearchPage(
+            items=[
+                PersonDetailSerializer(**hit["_source"]).model_dump(by_alias=True)
+                for hit in hits
+            ],
+            search_after=self.next_search_after(hits, page_size),
+        )
 
     async def search_persons(
         self,
@@ -46,25 +84,37 @@ class PersonService(ElasticService):
         page_number: int,
     ) -> list[dict[str, Any]]:
         offset = (page_number - 1) * page_size
-        es_query = {
-            "bool": {
-                "must": [
-                    {
-                        "multi_match": {
-                            "query": query,
-                            "fields": ["full_name^2"],
-                            "fuzziness": "auto",
-                        }
-                    }
-                ]
-            }
-        }
-        response = await self.search(query=es_query, size=page_size, offset=offset)
+        response = await self.search_template(
+            PERSONS_SEARCH_TEMPLATE_ID,
+            {"query": query, "from": offset, "size": page_size},
+            request_cache=True,
+            source=PERSONS_SEARCH_TEMPLATE,
+        )
         hits = response.get("hits", {}).get("hits", [])
         return [PersonDetailSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits]
 
-    async def film_participants(self, film_id: str) -> list[dict[str, Any]]:        
-        return []
+    async def suggest_persons(self, query: str, *, size: int) -> list[dict[str, Any]]:
+        documents = await self.suggest(
+            "full_name_suggest", query, size=size, source=("id", "full_name")
+        )
+        return [
+            PersonShortSerializer(**document).model_dump(by_alias=True)
+            for document in documents
+        ]
+
+    async def person_films(
+        self,
+        person_id: str,
+        *,
+        page_size: int,
+        page_number: int,
+    ) -> list[dict[str, Any]]:
+        document = await self.get_by_id(person_id, source=("films",))
+        if document is None:
+            return []
+        offset = (page_number - 1) * page_size
+        films = document.get("films", [])[offset:offset + page_size]
+        return [FilmShortSerializer(**film).model_dump(by_alias=True) for film in films]
 
     @staticmethod
     def _build_sort(sort: str | None) -> list[dict[str, Any]] | None:
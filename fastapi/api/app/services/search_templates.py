@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from elasticsearch import AsyncElasticsearch
+
+from .films import (
+    FILMS_FACETED_SEARCH_TEMPLATE,
+    FILMS_FACETED_SEARCH_TEMPLATE_ID,
+    FILMS_SEARCH_TEMPLATE,
+    FILMS_SEARCH_TEMPLATE_ID,
+)
+from .persons import PERSONS_SEARCH_TEMPLATE, PERSONS_SEARCH_TEMPLATE_ID
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TEMPLATES: dict[str, dict[str, Any]] = {
+    FILMS_SEARCH_TEMPLATE_ID: FILMS_SEARCH_TEMPLATE,
+    FILMS_FACETED_SEARCH_TEMPLATE_ID: FILMS_FACETED_SEARCH_TEMPLATE,
+    PERSONS_SEARCH_TEMPLATE_ID: PERSONS_SEARCH_TEMPLATE,
+}
+
+
+async def put_search_templates(elastic: AsyncElasticsearch) -> None:
+    """Store the search templates, existing versions are overwritten.
+
+    Runs on every start, so a changed template is deployed with the code
+    that sends its parameters.
+    """
+    for template_id, source in SEARCH_TEMPLATES.items():
+        await elastic.put_script(
+            id=template_id, script={"lang": "mustache", "source": source}
+        )
+        logger.info("Search template %s stored", template_id)
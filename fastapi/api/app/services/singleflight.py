@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def acquire_lock(redis: Redis, key: str, timeout: float) -> str | None:
+    """Take the Redis lock ``key`` for ``timeout`` seconds.
+
+    Returns the token to release it with, ``None`` when somebody else holds it.
+    """
+    token = uuid.uuid4().hex
+    acquired = await redis.set(key, token, nx=True, px=int(timeout * 1000))
+    return token if acquired else None
+
+
+async def release_lock(redis: Redis, key: str, token: str) -> None:
+    """Release ``key`` if it is still held with ``token``."""
+    await redis.eval(_RELEASE_SCRIPT, 1, key, token)
+
+
+class SingleFlight:
+    """Collapse concurrent loads of the same key into a single call.
+
+    Callers inside one worker share an ``asyncio`` task. When ``redis`` is
+    given, the task additionally takes a short Redis lock so that other
+    workers wait for the result to show up in the cache instead of loading
+    it themselves.
+    """
+
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        *,
+        lock_timeout: float = 5.0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self._redis = redis
+        self._lock_timeout = lock_timeout
+        self._poll_interval = poll_interval
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]],
+        *,
+        recheck: Callable[[], Awaitable[Any | None]] | None = None,
+    ) -> Any:
+        """Result of ``func`` for ``key``, shared with concurrent callers.
+
+        ``recheck`` looks the result up in the shared cache, anything but
+        ``None`` is returned instead of calling ``func``. It runs after the
+        Redis lock is taken, since the previous holder may just have filled
+        the cache, and while waiting for another worker's lock.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, func, recheck))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _run(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]],
+        recheck: Callable[[], Awaitable[Any | None]] | None,
+    ) -> Any:
+        if self._redis is None:
+            return await func()
+
+        lock_key = f"lock:{key}"
+        token = await acquire_lock(self._redis, lock_key, self._lock_timeout)
+        if token is not None:
+            try:
+                if recheck is not None:
+                    value = await recheck()
+                    if value is not None:
+                        return value
+                return await func()
+            finally:
+                await release_lock(self._redis, lock_key, token)
+
+        deadline = time.monotonic() + self._lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self._poll_interval)
+            if recheck is not None:
+                value = await recheck()
+                if value is not None:
+                    return value
+            if not await self._redis.exists(lock_key):
+                break
+        else:
+            logger.warning("Cache lock wait timed out for %s", key)
+
+        if recheck is not None:
+            value = await recheck()
+            if value is not None:
+                return value
+        return await func()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import inspect
+import uuid
+from enum import Enum
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Mapping, Sequence, get_type_hints
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.params import Depends as DependsParam
+from pydantic.fields import FieldInfo
+
+from ..core.dependencies import get_cache_service
+from ..services.cache import CacheService
+from ..services.codecs import CacheEntry
+
+_SKIP = object()
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedCall:
+    """Cache entry of one ``cached_response`` endpoint call."""
+
+    key: str
+    tags: list[str]
+    load: Callable[[], Awaitable[Any]]
+    ttl: int | None = None
+    negative_ttl: int | None = None
+
+    async def fetch(self, cache: CacheService) -> bytes | None:
+        entry = await self.fetch_entry(cache)
+        return None if entry is None else entry.body
+
+    async def fetch_entry(self, cache: CacheService) -> CacheEntry | None:
+        return await cache.get_or_set_entry(
+            self.key,
+            self.load,
+            tags=self.tags,
+            ttl=self.ttl,
+            negative_ttl=self.negative_ttl,
+        )
+
+
+def _canonical(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return _canonical(value.value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return canonical_params(dataclasses.asdict(value))
+    if isinstance(value, (list, tuple)):
+        items = [_canonical(item) for item in value]
+        return [item for item in items if item is not _SKIP]
+    return _SKIP
+
+
+def canonical_params(params: Mapping[str, Any]) -> dict[str, Any]:
+    """Reduce endpoint arguments to the values that identify a response.
+
+    Arguments named with a leading underscore, ``None`` values and objects
+    that are not plain data (services, the current user...) are dropped, so
+    an omitted query parameter and its default produce the same key.
+    """
+    result: dict[str, Any] = {}
+    for name, value in params.items():
+        if name.startswith("_"):
+            continue
+        value = _canonical(value)
+        if value is None or value is _SKIP:
+            continue
+        result[name] = value
+    return result
+
+
+def normalize_search_query(query: str) -> str:
+    """Lowercase, trim and collapse whitespace of a full-text query.
+
+    The analyzers do the same, so the hits do not change, but trivially
+    different spellings share cache entries (ours and the ES request cache).
+    """
+    return " ".join(query.split()).lower()
+
+
+def route_cache_key(namespace: str, **params: Any) -> str:
+    """Cache key of a ``cached_response`` endpoint called with ``params``."""
+    return CacheService.build_key(namespace, canonical_params(params))
+
+
+def _with_defaults(signature: inspect.Signature, kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Fill omitted query parameters with the values FastAPI would use."""
+    result = dict(kwargs)
+    for name, parameter in signature.parameters.items():
+        default = parameter.default
+        if name in result or default is inspect.Parameter.empty:
+            continue
+        if isinstance(default, DependsParam):
+            continue
+        if isinstance(default, FieldInfo):
+            if default.is_required():
+                continue
+            default = default.get_default(call_default_factory=True)
+        result[name] = default
+    return result
+
+
+async def cache_details(
+    cache: CacheService,
+    namespace: str,
+    items: Sequence[Mapping[str, Any]],
+    *,
+    id_param: str,
+    tags: Sequence[str] = (),
+    id_field: str = "uuid",
+    max_items: int | None = None,
+) -> None:
+    """Store list items under the keys of their detail endpoint.
+
+    Only for lists whose items are serialized exactly like the detail
+    response; all items go to Redis in one pipeline. ``max_items`` caps the
+    writes a single large page causes, the first items are stored.
+    """
+    if max_items is not None:
+        items = items[:max(0, max_items)]
+    if not items:
+        return
+    values: dict[str, Any] = {}
+    item_tags: dict[str, list[str]] = {}
+    for item in items:
+        params = canonical_params({id_param: item[id_field]})
+        key = CacheService.build_key(namespace, params)
+        values[key] = item
+        item_tags[key] = [tag.format(**params) for tag in tags]
+    await cache.set_many(values, tags=item_tags)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def cached_response(
+    namespace: str,
+    *,
+    tags: Sequence[str] = (),
+    ttl: int | None = None,
+    negative_ttl: int | None = None,
+    not_found_detail: str = "Not found",
+    normalize: Mapping[str, Callable[[Any], Any]] | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Response]]]:
+    """Cache-aside wrapper for JSON endpoints.
+
+    The wrapped endpoint only returns data (``None`` means 404, ``WithHeaders``
+    adds response headers that are cached along with the body). The wrapper
+    builds the key from the canonical endpoint arguments, serves cached bytes
+    with an ``ETag`` and answers ``If-None-Match`` with 304. ``tags`` are
+    formatted with the same arguments, e.g. ``"films:{film_id}"``.
+    ``normalize`` maps argument names to functions applied before the key is
+    built, the endpoint receives the normalized values as well.
+
+    ``endpoint.cached_call(**kwargs)`` describes the entry a request with
+    those arguments would use, so other code (the warm-up) shares its keys.
+    Omitted query parameters take their defaults, dependencies must be given.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Response]]:
+        hints = get_type_hints(func, include_extras=True)
+        signature = inspect.signature(func)
+        parameters = [
+            parameter.replace(annotation=hints.get(name, parameter.annotation))
+            for name, parameter in signature.parameters.items()
+        ]
+        parameters += [
+            inspect.Parameter(
+                "_cache_request",
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=Request,
+            ),
+            inspect.Parameter(
+                "_cache_service",
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=CacheService,
+                default=Depends(get_cache_service),
+            ),
+        ]
+
+        def cached_call(**kwargs: Any) -> CachedCall:
+            kwargs = _with_defaults(signature, kwargs)
+            for name, normalizer in (normalize or {}).items():
+                if kwargs.get(name) is not None:
+                    kwargs[name] = normalizer(kwargs[name])
+            key_params = canonical_params(kwargs)
+            return CachedCall(
+                key=CacheService.build_key(namespace, key_params),
+                tags=[tag.format(**key_params) for tag in tags],
+                load=partial(func, **kwargs),
+                ttl=ttl,
+                negative_ttl=negative_ttl,
+            )
+
+        @wraps(func)
+        async def wrapper(
+            *,
+            _cache_request: Request,
+            _cache_service: CacheService,
+            **kwargs: Any,
+        ) -> Response:
+            entry = await cached_call(**kwargs).fetch_entry(_cache_service)
+            if entry is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail=not_found_detail
+                )
+
+            headers = {**(entry.headers or {}), "ETag": _etag(entry.body)}
+            if _etag_matches(_cache_request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+            return Response(
+                content=entry.body, media_type="application/json", headers=headers
+            )
+
+        wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+            parameters=parameters, return_annotation=Response
+        )
+        wrapper.cached_call = cached_call  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
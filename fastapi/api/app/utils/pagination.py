@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import base64
+import json
 from dataclasses import dataclass
+from typing import Any
 
-from fastapi import Query
+from fastapi import Depends, HTTPException, Query, status
+
+from ..services.cache import WithHeaders
+from ..services.elastic import SearchPage
+
+DEFAULT_PAGE_SIZE = 50
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 @dataclass
@@ -11,8 +20,66 @@ class PageParams:
     page_number: int
 
 
+@dataclass
+class CursorPageParams(PageParams):
+    cursor: str | None = None
+
+
 def get_pagination_params(
-    page_size: int = Query(50, ge=1, le=1000),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000),
     page_number: int = Query(1, ge=1),
 ) -> PageParams:
     return PageParams(page_size=page_size, page_number=page_number)
+
+
+def get_cursor_pagination_params(
+    params: PageParams = Depends(get_pagination_params),
+    cursor: str | None = Query(
+        None,
+        description=(
+            f"Курсор следующей страницы из заголовка {NEXT_CURSOR_HEADER}, "
+            "page_number при этом не учитывается"
+        ),
+    ),
+) -> CursorPageParams:
+    return CursorPageParams(
+        page_size=params.page_size, page_number=params.page_number, cursor=cursor
+    )
+
+
+def encode_cursor(sort: str | None, search_after: list[Any]) -> str:
+    raw = json.dumps({"sort": sort, "after": search_after}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, sort: str | None) -> list[Any] | None:
+    """Sort values to continue after, the cursor must come from the same sort."""
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        search_after = data["after"]
+        valid = data.get("sort") == sort and isinstance(search_after, list)
+    except (ValueError, TypeError, KeyError, AttributeError):
+        valid = False
+    if not valid or not search_after:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор"
+        )
+    return search_after
+
+
+def page_content(page: SearchPage) -> Any:
+    """Items of the page, wrapped together with the facets if it has them."""
+    if page.facets is None:
+        return page.items
+    return {"items": page.items, "facets": page.facets}
+
+
+def cursor_page(page: SearchPage, sort: str | None) -> WithHeaders:
+    """List response with the next page cursor in ``X-Next-Cursor``."""
+    headers = {}
+    if page.search_after:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(sort, page.search_after)
+    return WithHeaders(page_content(page), headers)
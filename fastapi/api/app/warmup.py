@@ -0,0 +1,262 @@
+"""Pre-populate the response cache with the most requested pages.
+
+Runs as a startup task (``CACHE_WARMUP_ENABLED``) or once from the command
+line after a deploy or a Redis restart. A Redis lock lets only one worker
+or process warm the cache at a time, the others skip it::
+
+    python -m app.warmup
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Iterable, TypeVar
+
+from elasticsearch import ApiError, AsyncElasticsearch, TransportError
+from redis.asyncio import Redis, from_url as redis_from_url
+from redis.exceptions import RedisError
+
+from app.api.v1 import films, genres, persons
+from app.core.config import settings
+from app.integrations.elastic import create_elastic
+from app.services.cache import CacheService
+from app.services.codecs import CacheCodec, loads
+from app.services.films import FilmService
+from app.services.genres import GenreService
+from app.services.persons import PersonService
+from app.services.singleflight import acquire_lock, release_lock
+from app.utils.caching import CachedCall
+from app.utils.pagination import DEFAULT_PAGE_SIZE, CursorPageParams
+
+logger = logging.getLogger(__name__)
+
+FILM_SORTS = (None, "-imdb_rating", "imdb_rating", "title", "-title")
+GENRE_FILM_SORTS = (None, "-imdb_rating")
+MAX_GENRES = 1000
+WARMUP_LOCK_KEY = "lock:cache:warmup"
+
+T = TypeVar("T")
+
+
+@dataclass
+class WarmupReport:
+    loaded: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class CacheWarmer:
+    """Fill the cache through the same entries the routers use.
+
+    Keys already in the cache are skipped after one MGET per group; every
+    remaining entry costs one Elasticsearch request, issued sequentially at
+    no more than ``rate`` requests per second.
+    """
+
+    def __init__(
+        self,
+        cache: CacheService,
+        *,
+        film_service: FilmService,
+        genre_service: GenreService,
+        person_service: PersonService,
+        pages: int,
+        top_films: int,
+        rate: float,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        self._cache = cache
+        self._films = film_service
+        self._genres = genre_service
+        self._persons = person_service
+        self._pages = max(0, pages)
+        self._top_films = max(0, top_films)
+        self._interval = 1 / rate if rate > 0 else 0.0
+        self._page_size = page_size
+        self._next_request_at = 0.0
+        self.report = WarmupReport()
+
+    async def run(self) -> WarmupReport:
+        started = time.monotonic()
+        pages = [
+            CursorPageParams(page_size=self._page_size, page_number=number)
+            for number in range(1, self._pages + 1)
+        ]
+        await self._warm(
+            films.films_list.cached_call(
+                _=None,
+                params=page,
+                sort=sort,
+                genre=None,
+                film_service=self._films,
+                cache=self._cache,
+            )
+            for sort in FILM_SORTS
+            for page in pages
+        )
+        await self._warm(
+            genres.list_genres.cached_call(
+                _=None,
+                params=page,
+                sort=sort,
+                genre_service=self._genres,
+                cache=self._cache,
+            )
+            for sort in (None, "name")
+            for page in pages
+        )
+        await self._warm(
+            persons.list_persons.cached_call(
+                _=None,
+                params=page,
+                sort=None,
+                person_service=self._persons,
+                cache=self._cache,
+            )
+            for page in pages
+        )
+
+        all_genres = await self._throttled(
+            self._genres.list_genres(page_size=MAX_GENRES, page_number=1)
+        )
+        await self._warm(
+            films.films_list.cached_call(
+                _=None,
+                params=page,
+                sort=sort,
+                genre=[uuid.UUID(genre["uuid"])],
+                film_service=self._films,
+                cache=self._cache,
+            )
+            for genre in (all_genres.items if all_genres else [])
+            for sort in GENRE_FILM_SORTS
+            for page in pages
+        )
+
+        if self._top_films:
+            (top,) = await self._warm(
+                [
+                    films.films_list.cached_call(
+                        _=None,
+                        params=CursorPageParams(page_size=self._top_films, page_number=1),
+                        sort="-imdb_rating",
+                        genre=None,
+                        film_service=self._films,
+                        cache=self._cache,
+                    )
+                ]
+            )
+            await self._warm(
+                films.film_details.cached_call(
+                    film_id=uuid.UUID(film["uuid"]), _=None, film_service=self._films
+                )
+                for film in (loads(top) if top else [])
+            )
+
+        logger.info(
+            "Cache warm-up finished in %.1fs: %s loaded, %s already cached, %s failed",
+            time.monotonic() - started,
+            self.report.loaded,
+            self.report.skipped,
+            self.report.failed,
+        )
+        return self.report
+
+    async def _warm(self, calls: Iterable[CachedCall]) -> list[bytes | None]:
+        calls = list(calls)
+        if not calls:
+            return []
+        bodies = await self._cache.get_many_raw([call.key for call in calls])
+        for index, call in enumerate(calls):
+            if bodies[index] is not None:
+                self.report.skipped += 1
+                continue
+            bodies[index] = await self._throttled(call.fetch(self._cache))
+        return bodies
+
+    async def _throttled(self, request: Awaitable[T]) -> T | None:
+        delay = self._next_request_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._next_request_at = time.monotonic() + self._interval
+        try:
+            result = await request
+        except (ApiError, TransportError, RedisError) as exc:
+            logger.warning("Cache warm-up request failed: %s", exc)
+            self.report.failed += 1
+            return None
+        self.report.loaded += 1
+        return result
+
+
+async def run_exclusive(
+    warmer: CacheWarmer,
+    redis: Redis,
+    *,
+    lock_timeout: float,
+) -> WarmupReport | None:
+    """Run ``warmer`` unless another worker is already warming the cache.
+
+    The lock expires after ``lock_timeout`` seconds should its holder die.
+    """
+    try:
+        token = await acquire_lock(redis, WARMUP_LOCK_KEY, lock_timeout)
+    except RedisError as exc:
+        logger.warning("Cache warm-up skipped, lock unavailable: %s", exc)
+        return None
+    if token is None:
+        logger.info("Cache warm-up is running in another worker, skipped")
+        return None
+    try:
+        return await warmer.run()
+    finally:
+        try:
+            await release_lock(redis, WARMUP_LOCK_KEY, token)
+        except RedisError as exc:
+            logger.warning("Cache warm-up lock not released: %s", exc)
+
+
+def create_cache_warmer(
+    elastic: AsyncElasticsearch,
+    cache: CacheService,
+) -> CacheWarmer:
+    return CacheWarmer(
+        cache,
+        film_service=FilmService(elastic=elastic, settings=settings),
+        genre_service=GenreService(elastic=elastic, settings=settings),
+        person_service=PersonService(elastic=elastic, settings=settings),
+        pages=settings.cache_warmup_pages,
+        top_films=settings.cache_warmup_top_films,
+        rate=settings.cache_warmup_rate,
+    )
+
+
+async def main() -> None:
+    elastic = create_elastic(settings)
+    redis: Redis = redis_from_url(settings.redis_url)
+    cache = CacheService(
+        redis,
+        settings.cache_expire,
+        stale_ttl=settings.cache_stale_ttl,
+        codec=CacheCodec(
+            settings.cache_compression, min_bytes=settings.cache_compress_min_bytes
+        ),
+    )
+    try:
+        await run_exclusive(
+            create_cache_warmer(elastic, cache),
+            redis,
+            lock_timeout=settings.cache_warmup_lock_seconds,
+        )
+    finally:
+        await elastic.close()
+        await redis.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""Size of a cached list page per codec: legacy JSON text vs compressed bodies.
+
+Run from ``fastapi/api``::
+
+    python -m benchmarks.cache_payload_size --page-size 1000
+
+With ``--redis-url`` every payload is also written to Redis and its
+``MEMORY USAGE`` is reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from typing import Any, Dict, List
+
+from app.services.codecs import COMPRESSORS, CacheCodec, dumps
+
+from .response_serialization import make_page, measure
+
+
+def legacy_payload(page: List[Dict[str, Any]]) -> bytes:
+    """Value format used before response bodies were cached as bytes."""
+
+    return json.dumps(
+        {"value": page, "__soft_expires_at__": time.time()}, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def redis_memory(redis_url: str, payloads: Dict[str, bytes]) -> Dict[str, int]:
+    """Write payloads under throwaway keys and read ``MEMORY USAGE`` for each."""
+
+    from redis import Redis
+
+    client = Redis.from_url(redis_url)
+    prefix = f"benchmark:{uuid.uuid4()}"
+    usage: Dict[str, int] = {}
+    try:
+        for label, payload in payloads.items():
+            key = f"{prefix}:{label}"
+            client.set(key, payload, ex=60)
+            usage[label] = client.memory_usage(key, samples=0) or 0
+            client.delete(key)
+    finally:
+        client.close()
+    return usage
+
+
+def main() -> None:
+    """Print payload size, saving per key and codec cost for one page."""
+
+    parser = argparse.ArgumentParser(description="Cache payload size per codec")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    page = make_page(args.page_size)
+    codecs = {"none": CacheCodec("none")}
+    codecs.update({name: CacheCodec(name, min_bytes=1) for name in COMPRESSORS})
+
+    body = dumps(page)
+    payloads = {"legacy json": legacy_payload(page)}
+    results = []
+    for name, codec in codecs.items():
+        payload = codec.encode(body, time.time())
+        assert codec.decode(payload)[0] == body, f"{name} round trip failed"
+        payloads[name] = payload
+        results.append(
+            (
+                name,
+                measure(name, lambda: codec.encode(body, 0.0), args.samples),
+                measure(name, lambda: codec.decode(payload), args.samples),
+            )
+        )
+
+    memory = redis_memory(args.redis_url, payloads) if args.redis_url else {}
+    baseline = len(payloads["legacy json"])
+
+    print(f"page_size={args.page_size}, samples={args.samples}")
+    print("| Формат | Размер (байт) | Экономия на ключ (байт) | MEMORY USAGE | encode (мс) | decode (мс) |")
+    print("| --- | --- | --- | --- | --- | --- |")
+    print(f"| legacy json | {baseline} | 0 | {memory.get('legacy json', '-')} | - | - |")
+    for name, encode, decode in results:
+        size = len(payloads[name])
+        print(
+            "| {name} | {size} | {saved} | {memory} | {encode:.3f} | {decode:.3f} |".format(
+                name=name,
+                size=size,
+                saved=baseline - size,
+                memory=memory.get(name, "-"),
+                encode=encode["avg_ms"],
+                decode=decode["avg_ms"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
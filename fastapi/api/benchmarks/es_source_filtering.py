@@ -0,0 +1,116 @@
+"""Films search response with the full ``_source`` vs declared fields only.
+
+Run from ``fastapi/api``::
+
+    python -m benchmarks.es_source_filtering --page-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import uuid
+from typing import Any, Dict, List
+
+from app.db.serializers.film import FilmShortSerializer
+from app.services.films import FILM_SHORT_FIELDS
+
+from .response_serialization import measure
+
+
+def make_person() -> Dict[str, str]:
+    return {"id": str(uuid.uuid4()), "name": f"Person {uuid.uuid4().hex[:8]}"}
+
+
+def make_document(number: int) -> Dict[str, Any]:
+    """Film document shaped like the ETL output for ``movies``."""
+
+    actors = [make_person() for _ in range(12)]
+    writers = [make_person() for _ in range(3)]
+    directors = [make_person()]
+    return {
+        "id": str(uuid.uuid4()),
+        "imdb_rating": round(number % 100 / 10, 1),
+        "genres": [{"id": str(uuid.uuid4()), "name": "Drama", "description": "Drama"}],
+        "title": f"Film number {number}",
+        "description": "Long plot summary. " * 40,
+        "directors_names": [person["name"] for person in directors],
+        "actors_names": [person["name"] for person in actors],
+        "writers_names": [person["name"] for person in writers],
+        "directors": directors,
+        "actors": actors,
+        "writers": writers,
+    }
+
+
+def full_response(documents: List[Dict[str, Any]]) -> bytes:
+    hits = [
+        {
+            "_index": "movies",
+            "_id": document["id"],
+            "_score": None,
+            "_source": document,
+            "sort": [document["imdb_rating"], document["id"]],
+        }
+        for document in documents
+    ]
+    return json.dumps(
+        {
+            "took": 3,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"total": {"value": 10000, "relation": "gte"}, "max_score": None, "hits": hits},
+        }
+    ).encode("utf-8")
+
+
+def filtered_response(documents: List[Dict[str, Any]]) -> bytes:
+    """What ES returns with ``_source`` includes and ``filter_path``."""
+
+    hits = [
+        {
+            "_source": {field: document[field] for field in FILM_SHORT_FIELDS},
+            "sort": [document["imdb_rating"], document["id"]],
+        }
+        for document in documents
+    ]
+    return json.dumps({"hits": {"hits": hits}}).encode("utf-8")
+
+
+def to_items(raw: bytes) -> List[Dict[str, Any]]:
+    hits = json.loads(raw).get("hits", {}).get("hits", [])
+    return [FilmShortSerializer(**hit["_source"]).model_dump(by_alias=True) for hit in hits]
+
+
+def main() -> None:
+    """Compare response size and parse + serialize time for one page."""
+
+    parser = argparse.ArgumentParser(description="ES _source filtering gain")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    documents = [make_document(number) for number in range(args.page_size)]
+    full = full_response(documents)
+    filtered = filtered_response(documents)
+    assert to_items(full) == to_items(filtered), "filtered page differs"
+
+    results = [
+        (len(full), measure("full _source", lambda: to_items(full), args.samples)),
+        (len(filtered), measure("_source includes", lambda: to_items(filtered), args.samples)),
+    ]
+
+    print(f"page_size={args.page_size}, samples={args.samples}")
+    print("| Сценарий | Размер ответа (байт) | Среднее время (мс) | p95 (мс) |")
+    print("| --- | --- | --- | --- |")
+    for size, case in results:
+        print(
+            "| {label} | {size} | {avg:.3f} | {p95:.3f} |".format(
+                label=case["label"], size=size, avg=case["avg_ms"], p95=case["p95_ms"]
+            )
+        )
+    print(f"Size ratio: {len(full) / len(filtered):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
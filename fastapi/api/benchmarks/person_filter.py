@@ -0,0 +1,152 @@
+"""Films of a person: nested queries over actors/writers/directors vs a flat
+``person_ids`` terms filter, on a generated index.
+
+Needs a running Elasticsearch. Run from ``fastapi/api``::
+
+    python -m benchmarks.person_filter --es-url http://localhost:9200 --films 100000
+
+The benchmark index is dropped at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List
+
+from elasticsearch import Elasticsearch, helpers
+
+from .response_serialization import percentile
+
+ROLES = ("directors", "actors", "writers")
+NESTED_PERSON = {
+    "type": "nested",
+    "properties": {"id": {"type": "keyword"}, "name": {"type": "text"}},
+}
+MAPPING = {
+    "settings": {"number_of_replicas": 0, "refresh_interval": "-1"},
+    "mappings": {
+        "properties": {
+            "id": {"type": "keyword"},
+            "title": {"type": "text", "fields": {"raw": {"type": "keyword"}}},
+            "imdb_rating": {"type": "float"},
+            **{role: NESTED_PERSON for role in ROLES},
+            "person_ids": {"type": "keyword"},
+            "director_ids": {"type": "keyword"},
+            "actor_ids": {"type": "keyword"},
+            "writer_ids": {"type": "keyword"},
+        }
+    },
+}
+CAST_SIZES = {"directors": (1, 2), "actors": (5, 30), "writers": (1, 4)}
+
+
+def generate_films(count: int, persons: List[str], index: str) -> Iterator[Dict[str, Any]]:
+    """Bulk actions for ``count`` films with random casts."""
+
+    for number in range(count):
+        document: Dict[str, Any] = {
+            "id": str(uuid.uuid4()),
+            "title": f"Film number {number}",
+            "imdb_rating": round(random.uniform(1, 10), 1),
+        }
+        for role in ROLES:
+            people = random.sample(persons, random.randint(*CAST_SIZES[role]))
+            document[role] = [{"id": person, "name": person[:8]} for person in people]
+            document[f"{role[:-1]}_ids"] = people
+        document["person_ids"] = list(
+            dict.fromkeys(
+                document["director_ids"] + document["actor_ids"] + document["writer_ids"]
+            )
+        )
+        yield {"_index": index, "_id": document["id"], "_source": document}
+
+
+def nested_query(person_id: str) -> Dict[str, Any]:
+    """Query used by ``films_by_person`` before the flat fields existed."""
+
+    return {
+        "bool": {
+            "should": [
+                {"nested": {"path": path, "query": {"term": {f"{path}.id": person_id}}}}
+                for path in ROLES
+            ],
+            "minimum_should_match": 1,
+        }
+    }
+
+
+def terms_query(person_id: str) -> Dict[str, Any]:
+    return {"bool": {"filter": [{"terms": {"person_ids": [person_id]}}]}}
+
+
+def run(
+    client: Elasticsearch,
+    index: str,
+    build: Callable[[str], Dict[str, Any]],
+    persons: List[str],
+) -> Dict[str, float]:
+    took: List[float] = []
+    wall: List[float] = []
+    for person_id in persons:
+        start = time.perf_counter()
+        response = client.search(
+            index=index,
+            query=build(person_id),
+            size=50,
+            sort=[{"imdb_rating": "desc"}, {"id": "asc"}],
+            request_cache=False,
+        )
+        wall.append((time.perf_counter() - start) * 1000)
+        took.append(response["took"])
+    return {
+        "took_avg": sum(took) / len(took),
+        "took_p95": percentile(took, 0.95),
+        "wall_avg": sum(wall) / len(wall),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nested vs flat person filter")
+    parser.add_argument("--es-url", default="http://localhost:9200")
+    parser.add_argument("--films", type=int, default=100_000)
+    parser.add_argument("--persons", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--index", default="benchmark_person_filter")
+    args = parser.parse_args()
+
+    client = Elasticsearch(args.es_url, request_timeout=120)
+    persons = [str(uuid.uuid4()) for _ in range(args.persons)]
+    client.indices.delete(index=args.index, ignore_unavailable=True)
+    client.indices.create(index=args.index, **MAPPING)
+    try:
+        helpers.bulk(client, generate_films(args.films, persons, args.index), chunk_size=2000)
+        client.indices.refresh(index=args.index)
+        client.indices.forcemerge(index=args.index, max_num_segments=1)
+
+        sample = random.sample(persons, args.queries)
+        # Both variants run twice, the second pass shows the warm (filter cached) numbers.
+        results = []
+        variants = (("nested bool-should", nested_query), ("person_ids terms", terms_query))
+        for label, build in variants:
+            run(client, args.index, build, sample)
+            results.append((label, run(client, args.index, build, sample)))
+    finally:
+        client.indices.delete(index=args.index, ignore_unavailable=True)
+        client.close()
+
+    print(f"films={args.films}, persons={args.persons}, queries={args.queries}")
+    print("| Запрос | took, среднее (мс) | took, p95 (мс) | Время ответа (мс) |")
+    print("| --- | --- | --- | --- |")
+    for label, case in results:
+        print(
+            "| {label} | {avg:.2f} | {p95:.2f} | {wall:.2f} |".format(
+                label=label, avg=case["took_avg"], p95=case["took_p95"], wall=case["wall_avg"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Per-request serialization cost of a cached list page: re-validated vs raw bytes.
+
+Run from ``fastapi/api``::
+
+    python -m benchmarks.response_serialization --page-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Sequence
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.db.serializers.film import FilmShortSerializer
+from app.services.cache import CacheService
+
+
+def percentile(values: Sequence[float], perc: float) -> float:
+    """Return percentile for a given ordered list."""
+
+    ordered = sorted(values)
+    index = int((len(ordered) - 1) * perc)
+    return ordered[index]
+
+
+def make_page(page_size: int) -> List[Dict[str, Any]]:
+    """Build a films page shaped like ``FilmService.list_films`` output."""
+
+    return [
+        FilmShortSerializer(
+            id=str(uuid.uuid4()),
+            title=f"Film number {number}",
+            imdb_rating=round(number % 100 / 10, 1),
+        ).model_dump(by_alias=True)
+        for number in range(page_size)
+    ]
+
+
+def measure(label: str, action: Callable[[], Any], samples: int) -> Dict[str, Any]:
+    """Measure execution time of a callable in milliseconds."""
+
+    timings: List[float] = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "label": label,
+        "avg_ms": statistics.mean(timings),
+        "p95_ms": percentile(timings, 0.95),
+    }
+
+
+def main() -> None:
+    """Compare the old cache-hit path with returning cached bytes directly."""
+
+    parser = argparse.ArgumentParser(description="Cached response serialization cost")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    page = make_page(args.page_size)
+    body = CacheService.dumps(page)
+    legacy_payload = json.dumps(page, ensure_ascii=False)
+    field = create_response_field(
+        name="Response_films_list", type_=list[FilmShortSerializer], mode="serialization"
+    )
+
+    loop = asyncio.new_event_loop()
+
+    def revalidated() -> bytes:
+        # Old hit path: json.loads of the Redis value, response_model
+        # validation and serialization, then JSONResponse rendering.
+        content = json.loads(legacy_payload)
+        serialized = loop.run_until_complete(
+            serialize_response(field=field, response_content=content)
+        )
+        return JSONResponse(serialized).body
+
+    def raw_bytes() -> bytes:
+        return Response(content=body, media_type="application/json").body
+
+    assert revalidated() == raw_bytes(), "cached body differs from FastAPI output"
+
+    results = [
+        measure("json.loads + response_model + JSONResponse", revalidated, args.samples),
+        measure("cached bytes -> Response", raw_bytes, args.samples),
+    ]
+
+    print(f"page_size={args.page_size}, body={len(body)} bytes, samples={args.samples}")
+    print("| Сценарий | Среднее время (мс) | p95 (мс) |")
+    print("| --- | --- | --- |")
+    for case in results:
+        print(
+            "| {label} | {avg:.3f} | {p95:.3f} |".format(
+                label=case["label"], avg=case["avg_ms"], p95=case["p95_ms"]
+            )
+        )
+    saved = results[0]["avg_ms"] - results[1]["avg_ms"]
+    print(f"Saved per request: {saved:.3f} ms")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
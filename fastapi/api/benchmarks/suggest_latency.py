@@ -0,0 +1,153 @@
+"""Search-as-you-type latency: ``phrase_prefix`` multi_match used by
+``/films/search/`` vs ``bool_prefix`` on a ``search_as_you_type`` field.
+
+Needs a running Elasticsearch. Run from ``fastapi/api``::
+
+    python -m benchmarks.suggest_latency --es-url http://localhost:9200 --films 100000
+
+Every title is typed letter by letter, each prefix is one request, as the UI
+sends them. The benchmark index is dropped at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List
+
+from elasticsearch import Elasticsearch, helpers
+
+from .response_serialization import percentile
+
+WORDS = (
+    "star", "planet", "lonely", "adventure", "comedy", "night", "return", "empire",
+    "galaxy", "storm", "river", "shadow", "winter", "legend", "silent", "crew",
+)
+MAPPING = {
+    "settings": {"number_of_replicas": 0, "refresh_interval": "-1"},
+    "mappings": {
+        "properties": {
+            "id": {"type": "keyword"},
+            "title": {"type": "text", "fields": {"raw": {"type": "keyword"}}},
+            "title_suggest": {"type": "search_as_you_type"},
+            "description": {"type": "text"},
+            "actors_names": {"type": "text"},
+            "writers_names": {"type": "text"},
+        }
+    },
+}
+
+
+def make_title() -> str:
+    return " ".join(random.choices(WORDS, k=random.randint(1, 4))).capitalize()
+
+
+def generate_films(count: int, index: str) -> Iterator[Dict[str, Any]]:
+    for number in range(count):
+        title = f"{make_title()} {number}"
+        document = {
+            "id": str(uuid.uuid4()),
+            "title": title,
+            "title_suggest": title,
+            "description": " ".join(random.choices(WORDS, k=40)),
+            "actors_names": [make_title() for _ in range(5)],
+            "writers_names": [make_title()],
+        }
+        yield {"_index": index, "_id": document["id"], "_source": document}
+
+
+def phrase_prefix_body(text: str) -> Dict[str, Any]:
+    """What the UI sends today through ``/films/search/``."""
+
+    fields = ["title^2", "description", "actors_names", "writers_names"]
+    return {
+        "query": {
+            "bool": {
+                "should": [
+                    {"multi_match": {"query": text, "fields": fields, "fuzziness": "auto"}},
+                    {"multi_match": {"query": text, "fields": fields, "type": "phrase_prefix"}},
+                ],
+                "minimum_should_match": 1,
+            }
+        },
+        "_source": ["id", "title", "imdb_rating"],
+        "size": 50,
+    }
+
+
+def bool_prefix_body(text: str) -> Dict[str, Any]:
+    """Same query ``ElasticService.suggest`` builds."""
+
+    field = "title_suggest"
+    return {
+        "query": {
+            "multi_match": {
+                "query": text,
+                "type": "bool_prefix",
+                "fields": [field, f"{field}._2gram", f"{field}._3gram"],
+            }
+        },
+        "_source": ["id", "title"],
+        "size": 5,
+        "track_total_hits": False,
+    }
+
+
+def run(
+    client: Elasticsearch,
+    index: str,
+    build: Callable[[str], Dict[str, Any]],
+    prefixes: List[str],
+) -> Dict[str, float]:
+    wall: List[float] = []
+    for text in prefixes:
+        start = time.perf_counter()
+        client.search(index=index, body=build(text), request_cache=False)
+        wall.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50": percentile(wall, 0.5),
+        "p99": percentile(wall, 0.99),
+        "avg": sum(wall) / len(wall),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="phrase_prefix vs search_as_you_type")
+    parser.add_argument("--es-url", default="http://localhost:9200")
+    parser.add_argument("--films", type=int, default=100_000)
+    parser.add_argument("--titles", type=int, default=100)
+    parser.add_argument("--index", default="benchmark_suggest")
+    args = parser.parse_args()
+
+    client = Elasticsearch(args.es_url, request_timeout=120)
+    client.indices.delete(index=args.index, ignore_unavailable=True)
+    client.indices.create(index=args.index, **MAPPING)
+    try:
+        helpers.bulk(client, generate_films(args.films, args.index), chunk_size=2000)
+        client.indices.refresh(index=args.index)
+        client.indices.forcemerge(index=args.index, max_num_segments=1)
+
+        typed = [make_title().lower() for _ in range(args.titles)]
+        prefixes = [title[:end] for title in typed for end in range(2, len(title) + 1)]
+        results = []
+        variants = (("phrase_prefix", phrase_prefix_body), ("search_as_you_type", bool_prefix_body))
+        for label, build in variants:
+            run(client, args.index, build, prefixes[:50])
+            results.append((label, run(client, args.index, build, prefixes)))
+    finally:
+        client.indices.delete(index=args.index, ignore_unavailable=True)
+        client.close()
+
+    print(f"films={args.films}, requests={len(prefixes)}")
+    print("| Запрос | p50 (мс) | p99 (мс) | Среднее (мс) |")
+    print("| --- | --- | --- | --- |")
+    for label, case in results:
+        print(
+            "| {label} | {p50:.2f} | {p99:.2f} | {avg:.2f} |".format(label=label, **case)
+        )
+
+
+if __name__ == "__main__":
+    main()
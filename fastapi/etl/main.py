@@ -2,7 +2,7 @@ from __future__ import annotations
 import sys
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from logging import StreamHandler
 from importlib.resources import files
 
@@ -11,6 +11,7 @@ from movies_etl.state import JSONState
 from movies_etl.extract import PG
 from movies_etl.transform import to_es_doc, to_genre_doc, to_person_docs
 from movies_etl.load import ES
+from movies_etl.publish import CacheInvalidator
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +34,9 @@ def main() -> None:
     updated_after = parse_iso(state.get("movies_updated_after") or state.get("updated_after"))
     genres_updated_after = parse_iso(state.get("genres_updated_after"))
     persons_updated_after = parse_iso(state.get("persons_updated_after"))
+    movies_after_id = state.get("movies_after_id", "")
+    genres_after_id = state.get("genres_after_id", "")
+    persons_after_id = state.get("persons_after_id", "")
 
     pg = PG(
         host=cfg.pg_host,
@@ -46,6 +50,8 @@ def main() -> None:
     genres_es = ES(cfg.es_url, cfg.es_genres_index)
     persons_es = ES(cfg.es_url, cfg.es_persons_index)
 
+    invalidator = CacheInvalidator(cfg.redis_url, cfg.cache_invalidation_channel)
+
     movies_es.ensure_index(str(files("movies_etl").joinpath("movies_index.json")))
     genres_es.ensure_index(str(files("movies_etl").joinpath("genres_index.json")))
     persons_es.ensure_index(str(files("movies_etl").joinpath("persons_index.json")))
@@ -60,52 +66,69 @@ def main() -> None:
     while True:
         processed = False
 
-        movie_rows = pg.fetch_updated_ids(updated_after, cfg.batch_size)
+        movie_rows = pg.fetch_updated_ids(
+            updated_after, movies_after_id, cfg.batch_size
+        )
         if movie_rows:
             processed = True
             ids = [r[0] for r in movie_rows]
-            batch_max_updated = max(r[1] for r in movie_rows)
 
             films = pg.fetch_films(ids)
             docs = [to_es_doc(row).model_dump(mode="json") for row in films]
-            if docs:
-                movies_es.bulk_index(docs)
+            changed = movies_es.bulk_index(docs) if docs else []
+            invalidator.publish("films", changed)
 
-            safe_point = batch_max_updated - timedelta(microseconds=1)
-            state.set("movies_updated_after", safe_point.isoformat())
-            updated_after = safe_point
-            logger.info("Indexed %s films; state=%s", len(docs), updated_after.isoformat())
+            # Rows come ordered by (updated_at, id), the last one is the cursor.
+            movies_after_id, updated_after = movie_rows[-1]
+            state.set("movies_updated_after", updated_after.isoformat())
+            state.set("movies_after_id", movies_after_id)
+            logger.info(
+                "Indexed %s films, %s changed; state=%s",
+                len(docs),
+                len(changed),
+                updated_after.isoformat(),
+            )
 
-        genre_rows = pg.fetch_updated_genre_ids(genres_updated_after, cfg.batch_size)
+        genre_rows = pg.fetch_updated_genre_ids(
+            genres_updated_after, genres_after_id, cfg.batch_size
+        )
         if genre_rows:
             processed = True
             ids = [r[0] for r in genre_rows]
-            batch_max_updated = max(r[1] for r in genre_rows)
             genres = pg.fetch_genres(ids)
             docs = [to_genre_doc(row).model_dump(mode="json") for row in genres]
-            if docs:
-                genres_es.bulk_index(docs)
+            changed = genres_es.bulk_index(docs) if docs else []
+            invalidator.publish("genres", changed)
 
-            safe_point = batch_max_updated - timedelta(microseconds=1)
-            state.set("genres_updated_after", safe_point.isoformat())
-            genres_updated_after = safe_point
-            logger.info("Indexed %s genres; state=%s", len(docs), genres_updated_after.isoformat())
+            genres_after_id, genres_updated_after = genre_rows[-1]
+            state.set("genres_updated_after", genres_updated_after.isoformat())
+            state.set("genres_after_id", genres_after_id)
+            logger.info(
+                "Indexed %s genres, %s changed; state=%s",
+                len(docs),
+                len(changed),
+                genres_updated_after.isoformat(),
+            )
 
-        person_rows = pg.fetch_updated_person_ids(persons_updated_after, cfg.batch_size)
+        person_rows = pg.fetch_updated_person_ids(
+            persons_updated_after, persons_after_id, cfg.batch_size
+        )
         if person_rows:
             processed = True
             ids = [r[0] for r in person_rows]
-            batch_max_updated = max(r[1] for r in person_rows)
             persons = pg.fetch_persons(ids)
             docs = [doc.model_dump(mode="json") for doc in to_person_docs(persons)]
-            if docs:
-                persons_es.bulk_index(docs)
+            changed = persons_es.bulk_index(docs) if docs else []
+            invalidator.publish("persons", changed)
 
-            safe_point = batch_max_updated - timedelta(microseconds=1)
-            state.set("persons_updated_after", safe_point.isoformat())
-            persons_updated_after = safe_point
+            persons_after_id, persons_updated_after = person_rows[-1]
+            state.set("persons_updated_after", persons_updated_after.isoformat())
+            state.set("persons_after_id", persons_after_id)
             logger.info(
-                "Indexed %s persons; state=%s", len(docs), persons_updated_after.isoformat()
+                "Indexed %s persons, %s changed; state=%s",
+                len(docs),
+                len(changed),
+                persons_updated_after.isoformat(),
             )
 
         if not processed:
@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     es_genres_index: str = Field("genres", alias="ES_GENRES_INDEX")
     es_persons_index: str = Field("persons", alias="ES_PERSONS_INDEX")
 
+    # Redis (cache invalidation for the API)
+    redis_url: str | None = Field(None, alias="REDIS_URL")
+    cache_invalidation_channel: str = Field(
+        "cache:invalidate", alias="CACHE_INVALIDATION_CHANNEL"
+    )
+
     # ETL
     batch_size: int = Field(200, alias="BATCH_SIZE")
     state_file: str = Field(".state.json", alias="STATE_FILE")
@@ -41,7 +47,9 @@ class ESFilm(BaseModel):
     imdb_rating: float | None = None
     genres: list[ESGenre] = Field(default_factory=list)
     genre_names: list[str] = Field(default_factory=list)
+    genre_ids: list[str] = Field(default_factory=list)
     title: str | None = None
+    title_suggest: str | None = None
     description: str | None = None
     directors_names: list[str] = Field(default_factory=list)
     actors_names: list[str] = Field(default_factory=list)
@@ -49,9 +57,22 @@ class ESFilm(BaseModel):
     directors: list[ESFilmPerson] = Field(default_factory=list)
     actors: list[ESFilmPerson] = Field(default_factory=list)
     writers: list[ESFilmPerson] = Field(default_factory=list)
+    person_ids: list[str] = Field(default_factory=list)
+    director_ids: list[str] = Field(default_factory=list)
+    actor_ids: list[str] = Field(default_factory=list)
+    writer_ids: list[str] = Field(default_factory=list)
+
+
+class ESPersonFilm(BaseModel):
+    id: str
+    title: str | None = None
+    imdb_rating: float | None = None
+    roles: list[str] = Field(default_factory=list)
 
 
 class ESPerson(BaseModel):
     id: str
     full_name: str
+    full_name_suggest: str | None = None
+    films: list[ESPersonFilm] = Field(default_factory=list)
     
\ No newline at end of file
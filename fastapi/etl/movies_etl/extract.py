@@ -37,19 +37,21 @@ class PG:
             self._conn.close()
             self._conn = None
 
+    # The updated_* queries page by (updated_at, id): rows sharing the last
+    # timestamp of a batch are neither skipped nor read again.
     @backoff(logger=logger)
     def fetch_updated_ids(
-        self, updated_after: datetime, limit: int
+        self, updated_after: datetime, after_id: str, limit: int
     ) -> list[tuple[str, datetime]]:
         self.connect()
         assert self._conn
         with self._conn.cursor() as cur:
             cur.execute(
                 UPDATED_FW_IDS,
-                {"updated_after": updated_after, "limit": limit},
+                {"updated_after": updated_after, "after_id": after_id, "limit": limit},
             )
             rows = cur.fetchall()
-        return [(r[0], r[1]) for r in rows]
+        return [(str(r[0]), r[1]) for r in rows]
 
     @backoff(logger=logger)
     def fetch_films(self, ids: Sequence[str]) -> list[dict]:
@@ -66,17 +68,17 @@ class PG:
 
     @backoff(logger=logger)
     def fetch_updated_genre_ids(
-        self, updated_after: datetime, limit: int
+        self, updated_after: datetime, after_id: str, limit: int
     ) -> list[tuple[str, datetime]]:
         self.connect()
         assert self._conn
         with self._conn.cursor() as cur:
             cur.execute(
                 UPDATED_GENRE_IDS,
-                {"updated_after": updated_after, "limit": limit},
+                {"updated_after": updated_after, "after_id": after_id, "limit": limit},
             )
             rows = cur.fetchall()
-        return [(r[0], r[1]) for r in rows]
+        return [(str(r[0]), r[1]) for r in rows]
 
     @backoff(logger=logger)
     def fetch_genres(self, ids: Sequence[str]) -> list[dict]:
@@ -91,17 +93,17 @@ class PG:
 
     @backoff(logger=logger)
     def fetch_updated_person_ids(
-        self, updated_after: datetime, limit: int
+        self, updated_after: datetime, after_id: str, limit: int
     ) -> list[tuple[str, datetime]]:
         self.connect()
         assert self._conn
         with self._conn.cursor() as cur:
             cur.execute(
                 UPDATED_PERSON_IDS,
-                {"updated_after": updated_after, "limit": limit},
+                {"updated_after": updated_after, "after_id": after_id, "limit": limit},
             )
             rows = cur.fetchall()
-        return [(r[0], r[1]) for r in rows]
+        return [(str(r[0]), r[1]) for r in rows]
 
     @backoff(logger=logger)
     def fetch_persons(self, ids: Sequence[str]) -> list[dict]:
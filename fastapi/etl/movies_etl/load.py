@@ -26,13 +26,27 @@ class ES:
         self.client.indices.create(index=self.index, body=body)
 
     @backoff(exceptions=(ESConnectionError,), logger=logger)
-    def bulk_index(self, docs: Iterable[dict]) -> None:
+    def bulk_index(self, docs: Iterable[dict]) -> list[str]:
+        """Index ``docs``, returns the ids of documents that changed.
+
+        Documents go in as upserts so that Elasticsearch reports unchanged
+        ones as ``noop``; only the changed ids need their cache dropped.
+        """
         actions = (
             {
+                "_op_type": "update",
                 "_index": self.index,
                 "_id": doc["id"],
-                "_source": doc,
+                "doc": doc,
+                "doc_as_upsert": True,
             }
             for doc in docs
         )
-        helpers.bulk(self.client, actions, stats_only=True)
+        changed: list[str] = []
+        # Wait until the documents are searchable: the API cache is
+        # invalidated right after this returns and must not re-cache old data.
+        for _, item in helpers.streaming_bulk(self.client, actions, refresh="wait_for"):
+            result = item["update"]
+            if result.get("result") != "noop":
+                changed.append(result["_id"])
+        return changed
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import Iterable
+
+from redis import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from .backoff import backoff
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidator:
+    """Publishes ids of changed documents so the API can drop cached pages."""
+
+    def __init__(self, url: str | None, channel: str) -> None:
+        self.client = Redis.from_url(url) if url else None
+        self.channel = channel
+
+    @backoff(exceptions=(RedisConnectionError,), logger=logger)
+    def publish(self, entity: str, ids: Iterable[str]) -> None:
+        if self.client is None:
+            return
+        ids = list(ids)
+        if not ids:
+            return
+        message = json.dumps({"entity": entity, "ids": ids})
+        self.client.publish(self.channel, message)
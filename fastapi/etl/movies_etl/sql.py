@@ -16,8 +16,8 @@ WITH updates AS (
 )
 SELECT id, updated_at
 FROM updates
-WHERE updated_at > %(updated_after)s
-ORDER BY updated_at, id
+WHERE (updated_at, id::text) > (%(updated_after)s, %(after_id)s)
+ORDER BY updated_at, id::text
 LIMIT %(limit)s;
 """
 
@@ -72,8 +72,8 @@ WITH updates AS (
 )
 SELECT id, updated_at
 FROM updates
-WHERE updated_at > %(updated_after)s
-ORDER BY updated_at, id
+WHERE (updated_at, id::text) > (%(updated_after)s, %(after_id)s)
+ORDER BY updated_at, id::text
 LIMIT %(limit)s;
 """
 
@@ -105,8 +105,8 @@ WITH updates AS (
 )
 SELECT id, updated_at
 FROM updates
-WHERE updated_at > %(updated_after)s
-ORDER BY updated_at, id
+WHERE (updated_at, id::text) > (%(updated_after)s, %(after_id)s)
+ORDER BY updated_at, id::text
 LIMIT %(limit)s;
 """
 
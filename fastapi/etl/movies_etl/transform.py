@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import Any
 from collections import defaultdict
 
-from .config import ESFilm, ESFilmPerson, ESGenre, ESPerson
+from .config import ESFilm, ESFilmPerson, ESGenre, ESPerson, ESPersonFilm
 
 NA_VALUES = {"n/a", "N/A", "NA", "None", None, ""}
 
@@ -42,12 +42,15 @@ def to_es_doc(row: dict) -> ESFilm:
         genres.append(ESGenre(id=gid, name=name, description=description))
         genre_names.append(name)
 
+    title = _clean(row.get("title"))
     doc = ESFilm(
         id=row["id"],
         imdb_rating=float(row["imdb_rating"]) if row["imdb_rating"] is not None else 0.0,
         genres=genres,
         genre_names=genre_names,
-        title=_clean(row.get("title")),
+        genre_ids=[genre.id for genre in genres],
+        title=title,
+        title_suggest=title,
         description=_clean(row.get("description")),
         directors_names=[p["name"] for p in directors],
         actors_names=[p["name"] for p in actors],
@@ -55,6 +58,10 @@ def to_es_doc(row: dict) -> ESFilm:
         directors=[ESFilmPerson(**p) for p in directors],
         actors=[ESFilmPerson(**p) for p in actors],
         writers=[ESFilmPerson(**p) for p in writers],
+        person_ids=list(dict.fromkeys(p["id"] for p in directors + actors + writers)),
+        director_ids=[p["id"] for p in directors],
+        actor_ids=[p["id"] for p in actors],
+        writer_ids=[p["id"] for p in writers],
     )
     return doc
 
@@ -69,6 +76,7 @@ def to_genre_doc(row: dict) -> ESGenre:
 
 def to_person_docs(rows: list[dict]) -> list[ESPerson]:
     persons: dict[str, ESPerson] = {}
+    films: dict[str, dict[str, ESPersonFilm]] = defaultdict(dict)
 
     for row in rows:
         pid = row.get("person_id")
@@ -78,5 +86,24 @@ def to_person_docs(rows: list[dict]) -> list[ESPerson]:
         if not full_name:
             continue    
         if pid not in persons:
-            persons[pid] = ESPerson(id=pid, full_name=full_name)
+            persons[pid] = ESPerson(
+                id=pid, full_name=full_name, full_name_suggest=full_name
+            )
+
+        fid = row.get("film_id")
+        if not fid:
+            continue
+        film = films[pid].get(fid)
+        if film is None:
+            rating = row.get("imdb_rating")
+            film = ESPersonFilm(
+                id=fid,
+                title=_clean(row.get("film_title")),
+                imdb_rating=float(rating) if rating is not None else None,
+            )
+            films[pid][fid] = film
+            persons[pid].films.append(film)
+        role = (row.get("role") or "").strip().lower()
+        if role and role not in film.roles:
+            film.roles.append(role)
     return list(persons.values())
\ No newline at end of file
@@ -19,6 +19,9 @@ class TestSettings(BaseSettings):
     redis_host: str = Field(default="127.0.0.1", alias="REDIS_HOST")
     redis_port: int = Field(default=6379, alias="REDIS_PORT")
     redis_db: int = Field(default=0, alias="REDIS_DB")
+    cache_invalidation_channel: str = Field(
+        default="cache:invalidate", alias="CACHE_INVALIDATION_CHANNEL"
+    )
     
     @property
     def redis_url(self) -> str:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import uuid
 from http import HTTPStatus
 import pytest
 
 from tests.functional.settings import test_settings
 from tests.functional.testdata import es_data
+from tests.functional.utils.helpers import load_bulk
 
 
 @pytest.mark.asyncio
@@ -71,6 +74,29 @@ async def test_films_list_returns_all_movies(load_movies, http_session, service_
     assert len(body) == len(es_data.MOVIES)
 
 
+@pytest.mark.asyncio
+async def test_films_list_cursor_pagination(load_movies, http_session, service_url):
+    await load_movies()
+
+    url = f"{service_url}/api/v1/films/"
+    params = {"page_size": 1, "sort": "-imdb_rating"}
+    seen: list[str] = []
+    while True:
+        async with http_session.get(url, params=params) as response:
+            assert response.status == HTTPStatus.OK
+            seen.extend(film["uuid"] for film in await response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert sorted(seen) == sorted(movie["id"] for movie in es_data.MOVIES)
+
+    params = {"page_size": 1, "sort": "title", "cursor": params["cursor"]}
+    async with http_session.get(url, params=params) as response:
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+
 @pytest.mark.asyncio
 async def test_film_details_cached(load_movies, http_session, es_client, service_url):
     await load_movies()
@@ -89,4 +115,169 @@ async def test_film_details_cached(load_movies, http_session, es_client, service
         cached = await cached_response.json()
 
 
-    assert cached == first
\ No newline at end of file
+    assert cached == first
+
+
+@pytest.mark.asyncio
+async def test_film_details_etag_not_modified(load_movies, http_session, service_url):
+    await load_movies()
+
+    film_id = es_data.MOVIES[0]["id"]
+    url = f"{service_url}/api/v1/films/{film_id}"
+    async with http_session.get(url) as response:
+        assert response.status == HTTPStatus.OK
+        etag = response.headers["ETag"]
+
+    headers = {"If-None-Match": etag}
+    async with http_session.get(url, headers=headers) as response:
+        assert response.status == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_film_details_not_found_cached_until_invalidated(
+    load_movies, http_session, es_client, redis_client, service_url
+):
+    await load_movies()
+
+    film = dict(es_data.MOVIES[0], id=str(uuid.uuid4()))
+    url = f"{service_url}/api/v1/films/{film['id']}"
+    async with http_session.get(url) as response:
+        assert response.status == HTTPStatus.NOT_FOUND
+
+    await load_bulk(es_client, test_settings.es_movies_index, [film])
+
+    async with http_session.get(url) as response:
+        assert response.status == HTTPStatus.NOT_FOUND
+
+    await redis_client.publish(
+        test_settings.cache_invalidation_channel,
+        json.dumps({"entity": "films", "ids": [film["id"]]}),
+    )
+    for _ in range(20):
+        async with http_session.get(url) as response:
+            if response.status == HTTPStatus.OK:
+                break
+        await asyncio.sleep(0.1)
+    assert response.status == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_films_batch_returns_found_films_in_order(
+    load_movies, http_session, service_url
+):
+    await load_movies()
+
+    ids = [es_data.MOVIES[2]["id"], str(uuid.uuid4()), es_data.MOVIES[0]["id"]]
+    url = f"{service_url}/api/v1/films/batch"
+    async with http_session.get(f"{service_url}/api/v1/films/{ids[2]}") as response:
+        assert response.status == HTTPStatus.OK
+        cached = await response.json()
+
+    async with http_session.post(url, json={"ids": ids}) as response:
+        assert response.status == HTTPStatus.OK
+        body = await response.json()
+
+    assert [film["uuid"] for film in body] == [ids[0], ids[2]]
+    assert body[1] == cached
+
+
+@pytest.mark.asyncio
+async def test_film_persons_returns_roles(load_persons, http_session, service_url):
+    await load_persons()
+
+    film = es_data.MOVIES[0]
+    url = f"{service_url}/api/v1/films/{film['id']}/persons"
+    async with http_session.get(url) as response:
+        assert response.status == HTTPStatus.OK
+        payload = await response.json()
+
+    assert payload["uuid"] == film["id"]
+    assert payload["title"] == film["title"]
+    assert {person["uuid"]: person["roles"] for person in payload["persons"]} == {
+        es_data.ACTOR_ONE_ID: ["actor"],
+        es_data.ACTOR_TWO_ID: ["actor"],
+        es_data.WRITER_ID: ["writer"],
+        es_data.DIRECTOR_ID: ["director"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_films_list_filtered_by_person_role(load_movies, http_session, service_url):
+    await load_movies()
+
+    url = f"{service_url}/api/v1/films/"
+    params = {"person": es_data.ACTOR_ONE_ID, "role": "actor"}
+    async with http_session.get(url, params=params) as response:
+        assert response.status == HTTPStatus.OK
+        body = await response.json()
+    assert {film["uuid"] for film in body} == {
+        es_data.MOVIES[0]["id"],
+        es_data.MOVIES[1]["id"],
+    }
+
+    params = {"person": es_data.ACTOR_ONE_ID, "role": "director"}
+    async with http_session.get(url, params=params) as response:
+        assert response.status == HTTPStatus.OK
+        assert await response.json() == []
+
+    async with http_session.get(url, params={"role": "actor"}) as response:
+        assert response.status == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_films_list_filtered_by_genres(load_movies, http_session, service_url):
+    await load_movies()
+
+    url = f"{service_url}/api/v1/films/"
+    cases = [
+        ([("genre", es_data.ACTION_ID)], {0, 2}),
+        ([("genre", es_data.ACTION_ID), ("genre", es_data.DRAMA_ID)], {0, 1, 2}),
+        (
+            [
+                ("genre", es_data.ACTION_ID),
+                ("genre", es_data.DRAMA_ID),
+                ("genre_mode", "all"),
+            ],
+            {0},
+        ),
+    ]
+    for params, expected in cases:
+        async with http_session.get(url, params=params) as response:
+            assert response.status == HTTPStatus.OK
+            body = await response.json()
+        assert {film["uuid"] for film in body} == {
+            es_data.MOVIES[index]["id"] for index in expected
+        }
+
+
+@pytest.mark.asyncio
+async def test_films_list_with_facets(load_movies, http_session, service_url):
+    await load_movies()
+
+    url = f"{service_url}/api/v1/films/"
+    async with http_session.get(url, params={"facets": "true"}) as response:
+        assert response.status == HTTPStatus.OK
+        body = await response.json()
+    assert len(body["items"]) == len(es_data.MOVIES)
+    assert {facet["name"]: facet["count"] for facet in body["facets"]["genres"]} == {
+        "Action": 2,
+        "Drama": 2,
+        "Comedy": 2,
+    }
+    rating = {facet["rating"]: facet["count"] for facet in body["facets"]["rating"]}
+    assert rating[8.0] == rating[7.0] == rating[6.0] == 1
+
+    params = {"facets": "true", "genre": es_data.COMEDY_ID}
+    async with http_session.get(url, params=params) as response:
+        assert response.status == HTTPStatus.OK
+        body = await response.json()
+    assert len(body["items"]) == 2
+    assert {facet["name"]: facet["count"] for facet in body["facets"]["genres"]} == {
+        "Comedy": 2,
+        "Action": 1,
+        "Drama": 1,
+    }
+
+    async with http_session.get(url) as response:
+        assert isinstance(await response.json(), list)
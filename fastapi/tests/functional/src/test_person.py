@@ -43,6 +43,10 @@ async def test_person_details(load_persons, http_session, service_url):
     assert payload == {
         "uuid": person_id,
         "full_name": es_data.PERSONS[0]["full_name"],
+        "films": [
+            {"uuid": film["id"], "roles": film["roles"]}
+            for film in es_data.PERSONS[0]["films"]
+        ],
     }
 
 
@@ -68,4 +68,46 @@ async def test_search_uses_cache(load_movies, http_session, es_client, service_u
     async with http_session.get(url, params=params) as cached_response:
         assert cached_response.status == HTTPStatus.OK
         cached_payload = await cached_response.json()
-    assert cached_payload == initial_payload
\ No newline at end of file
+    assert cached_payload == initial_payload
+
+@pytest.mark.asyncio
+async def test_search_normalized_queries_share_cache(
+    load_movies, http_session, es_client, service_url
+):
+    await load_movies()
+
+    url = f"{service_url}/api/v1/films/search/"
+    async with http_session.get(url, params={"query": "Star Adventure "}) as response:
+        assert response.status == HTTPStatus.OK
+        initial_payload = await response.json()
+    assert initial_payload
+
+    await es_client.indices.delete(index=test_settings.es_movies_index)
+
+    params = {"query": "  star   adventure"}
+    async with http_session.get(url, params=params) as cached_response:
+        assert cached_response.status == HTTPStatus.OK
+        cached_payload = await cached_response.json()
+    assert cached_payload == initial_payload
+
+
+@pytest.mark.asyncio
+async def test_suggest_matches_prefixes(load_all_data, http_session, service_url):
+    await load_all_data()
+
+    url = f"{service_url}/api/v1/suggest/"
+    async with http_session.get(url, params={"query": "sta"}) as response:
+        assert response.status == HTTPStatus.OK
+        body = await response.json()
+    assert {film["title"] for film in body["films"]} == {
+        es_data.MOVIES[0]["title"],
+        es_data.MOVIES[2]["title"],
+    }
+    assert all(set(film) == {"uuid", "title"} for film in body["films"])
+    assert body["persons"] == []
+
+    async with http_session.get(url, params={"query": "Ann B"}) as response:
+        assert response.status == HTTPStatus.OK
+        body = await response.json()
+    assert body["films"] == []
+    assert body["persons"] == [{"uuid": es_data.ACTOR_ONE_ID, "full_name": "Ann Black"}]
@@ -29,13 +29,6 @@ GENRES = [
     },
 ]
 
-PERSONS = [
-    {"id": ACTOR_ONE_ID, "full_name": "Ann Black"},
-    {"id": ACTOR_TWO_ID, "full_name": "Bob Green"},
-    {"id": WRITER_ID, "full_name": "Chris White"},
-    {"id": DIRECTOR_ID, "full_name": "Dora Brown"},
-]
-
 MOVIES = [
     {
         "id": "a4a4381d-7f0c-4a1f-9e2d-4a7e6371af86",
@@ -85,4 +78,52 @@ MOVIES = [
         "writers_names": ["Chris White"],
         "directors_names": ["Dora Brown"],
     },
-]
\ No newline at end of file
+]
+
+
+for _movie in MOVIES:
+    _movie["genre_ids"] = [genre["id"] for genre in _movie["genres"]]
+    _movie["genre_names"] = [genre["name"] for genre in _movie["genres"]]
+    _movie["title_suggest"] = _movie["title"]
+    for _field in ("directors", "actors", "writers"):
+        _movie[f"{_field[:-1]}_ids"] = [person["id"] for person in _movie[_field]]
+    _movie["person_ids"] = list(
+        dict.fromkeys(
+            _movie["director_ids"] + _movie["actor_ids"] + _movie["writer_ids"]
+        )
+    )
+
+
+def _person_films(person_id: str) -> list[dict]:
+    films = []
+    for movie in MOVIES:
+        roles = [
+            role
+            for role, field in (
+                ("actor", "actors"),
+                ("writer", "writers"),
+                ("director", "directors"),
+            )
+            if any(person["id"] == person_id for person in movie[field])
+        ]
+        if roles:
+            films.append(
+                {
+                    "id": movie["id"],
+                    "title": movie["title"],
+                    "imdb_rating": movie["imdb_rating"],
+                    "roles": roles,
+                }
+            )
+    return films
+
+
+PERSONS = [
+    {"id": ACTOR_ONE_ID, "full_name": "Ann Black", "films": _person_films(ACTOR_ONE_ID)},
+    {"id": ACTOR_TWO_ID, "full_name": "Bob Green", "films": _person_films(ACTOR_TWO_ID)},
+    {"id": WRITER_ID, "full_name": "Chris White", "films": _person_films(WRITER_ID)},
+    {"id": DIRECTOR_ID, "full_name": "Dora Brown", "films": _person_films(DIRECTOR_ID)},
+]
+
+for _person in PERSONS:
+    _person["full_name_suggest"] = _person["full_name"]
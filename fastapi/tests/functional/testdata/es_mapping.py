@@ -20,6 +20,7 @@ MOVIES_INDEX_MAPPING = {
                 "fields": {"raw": {"type": "keyword"}},
                 "analyzer": "ru_en",
             },
+            "title_suggest": {"type": "search_as_you_type"},
             "imdb_rating": {"type": "float"},
             "description": {"type": "text", "analyzer": "ru_en"},
             "actors_names": {"type": "text", "analyzer": "ru_en"},
@@ -66,6 +67,12 @@ MOVIES_INDEX_MAPPING = {
                     },
                 },
             },
+            "genre_ids": {"type": "keyword"},
+            "genre_names": {"type": "keyword"},
+            "person_ids": {"type": "keyword"},
+            "director_ids": {"type": "keyword"},
+            "actor_ids": {"type": "keyword"},
+            "writer_ids": {"type": "keyword"},
         }
     },
 }
@@ -93,6 +100,16 @@ PERSONS_INDEX_MAPPING = {
                 "type": "text",
                 "fields": {"raw": {"type": "keyword"}},
             },
+            "full_name_suggest": {"type": "search_as_you_type"},
+            "films": {
+                "type": "nested",
+                "properties": {
+                    "id": {"type": "keyword"},
+                    "title": {"type": "text"},
+                    "imdb_rating": {"type": "float"},
+                    "roles": {"type": "keyword"},
+                },
+            },
         }
     },
 }
\ No newline at end of file
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+# The unit tests import the API package directly, without a running service.
+API_ROOT = Path(__file__).resolve().parents[2] / "api"
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+# Settings are read at import time, the unit tests only need them to parse.
+for name, value in {
+    "PROJECT_NAME": "movies",
+    "PROJECT_DESCRIPTION": "unit tests",
+    "PROJECT_VERSION": "0",
+    "ES_HOST": "localhost",
+    "ES_PORT": "9200",
+    "ES_MOVIES_INDEX": "movies",
+    "ES_GENRES_INDEX": "genres",
+    "ES_PERSONS_INDEX": "persons",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_DB": "0",
+    "CACHE_EXPIRE_SECONDS": "60",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "movies",
+    "POSTGRES_USER": "app",
+    "POSTGRES_PASSWORD": "app",
+    "POSTGRES_SCHEMA": "content",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+
+from app.services import cache as cache_module
+from app.services.cache import CacheService
+from app.services.singleflight import SingleFlight
+
+
+@pytest_asyncio.fixture
+async def redis():
+    client = fakeredis.aioredis.FakeRedis()
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_drops_tagged_entries(redis):
+    cache = CacheService(redis, ttl=60)
+    await cache.set("films:list:1", [1], tags=("films",))
+    await cache.set("films:detail:a", {"id": "a"}, tags=("films", "films:a"))
+    await cache.set("genres:list:1", [2], tags=("genres",))
+
+    await cache.invalidate_tags(["films:a"])
+    assert await cache.get("films:detail:a") is None
+    assert await cache.get("films:list:1") == [1]
+
+    await cache.invalidate_tags(["films", "missing"])
+    assert await cache.get("films:list:1") is None
+    assert await cache.get("genres:list:1") == [2]
+    assert await redis.keys("cache:tags:films*") == []
+
+
+@pytest.mark.asyncio
+async def test_tag_index_forgets_expired_keys(redis, monkeypatch):
+    cache = CacheService(redis, ttl=10, stale_ttl=5)
+    now = 1_000.0
+    monkeypatch.setattr("app.services.cache.time.time", lambda: now)
+    for number in range(20):
+        await cache.set(f"films:list:{number}", [number], tags=("films",))
+    assert await redis.zcard("cache:tags:films") == 20
+
+    # Past the hard expiry of the first entries, the next write prunes them.
+    now += 16
+    await cache.set("films:list:new", [], tags=("films",))
+    assert await redis.zrange("cache:tags:films", 0, -1) == [b"films:list:new"]
+
+
+@pytest.mark.asyncio
+async def test_entries_written_during_invalidation_survive(redis):
+    cache = CacheService(redis, ttl=60)
+    await cache.set("films:list:old", [1], tags=("films",))
+    await redis.rename("cache:tags:films", "cache:tags:films:other")
+    await cache.set("films:list:new", [2], tags=("films",))
+    await redis.rename("cache:tags:films:other", "cache:tags:films:purge:x")
+
+    await cache._purge_tag("cache:tags:films:purge:x")
+    await cache._purge_tag("cache:tags:films:purge:x")
+    assert await cache.get("films:list:old") is None
+    assert await cache.get("films:list:new") == [2]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Loader:
+    def __init__(self, *values) -> None:
+        self.values = list(values)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+async def refreshed() -> None:
+    await asyncio.gather(*list(cache_module._background_tasks), return_exceptions=True)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("app.services.cache.time.time", clock)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_and_refreshed_once(redis, clock):
+    cache = CacheService(redis, ttl=10, stale_ttl=60, flight=SingleFlight(redis))
+    loader = Loader({"v": 1}, {"v": 2})
+    assert await cache.get_or_set("k", loader) == cache.dumps({"v": 1})
+
+    clock.now += 11
+    served = await asyncio.gather(*(cache.get_or_set("k", loader) for _ in range(5)))
+    assert served == [cache.dumps({"v": 1})] * 5
+    assert cache.stats.stale_hits == 5
+
+    await refreshed()
+    assert loader.calls == 2
+    assert await cache.get_or_set("k", loader) == cache.dumps({"v": 2})
+
+
+@pytest.mark.asyncio
+async def test_hard_expired_entry_is_loaded_synchronously(redis, clock):
+    cache = CacheService(redis, ttl=10, stale_ttl=5)
+    loader = Loader({"v": 1}, {"v": 2})
+    await cache.get_or_set("k", loader)
+    assert await redis.ttl("k") == 15
+
+    # Redis drops the entry at its hard expiry.
+    clock.now += 16
+    await redis.delete("k")
+    assert await cache.get_or_set("k", loader) == cache.dumps({"v": 2})
+    assert loader.calls == 2
+    assert cache.stats.stale_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_the_stale_entry(redis, clock):
+    cache = CacheService(redis, ttl=10, stale_ttl=60)
+    loader = Loader({"v": 1}, RuntimeError("search is down"), {"v": 3})
+    await cache.get_or_set("k", loader)
+
+    clock.now += 11
+    assert await cache.get_or_set("k", loader) == cache.dumps({"v": 1})
+    await refreshed()
+    assert loader.calls == 2
+    assert await cache.get_or_set("k", loader) == cache.dumps({"v": 1})
+    await refreshed()
+    assert await cache.get_or_set("k", loader) == cache.dumps({"v": 3})
+
+
+@pytest.mark.asyncio
+async def test_set_many_raw_stores_negative_entries_with_their_ttl(redis):
+    cache = CacheService(redis, ttl=60)
+    await cache.set_many_raw({"found": b"[1]", "missing": None}, negative_ttl=5)
+
+    found, missing, unknown = await cache.get_many_entries(["found", "missing", "unknown"])
+    assert found.body == b"[1]" and missing.body is None and unknown is None
+    assert await redis.ttl("found") == 60
+    assert await redis.ttl("missing") == 5
+
+    # Without a negative ttl there is nothing to remember.
+    await cache.set_many_raw({"skipped": None})
+    assert not await redis.exists("skipped")
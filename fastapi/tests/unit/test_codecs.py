@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.codecs import COMPRESSORS, CacheCodec, CacheCodecError
+
+BODY = b'{"items":[' + b",".join(b'{"id":%d}' % i for i in range(200)) + b"]}"
+
+
+@pytest.mark.parametrize("compression", ["none", *COMPRESSORS])
+def test_round_trip(compression):
+    codec = CacheCodec(compression, min_bytes=1)
+    entry = codec.decode(codec.encode(BODY, 123.0, {"x-next-cursor": "abc"}))
+    assert entry.body == BODY
+    assert entry.soft_expires_at == 123.0
+    assert entry.headers == {"x-next-cursor": "abc"}
+
+
+def test_negative_entry():
+    codec = CacheCodec()
+    assert codec.decode(codec.encode(None, 1.0)).body is None
+
+
+@pytest.mark.parametrize(
+    "cached",
+    [
+        b"\x10",
+        b"\x10\x00",
+        b"\x20" + b"\x00" * 8,
+        b"{not json",
+        b'{"__soft_expires_at__": 1}',
+    ],
+)
+def test_truncated_values_are_unreadable(cached):
+    with pytest.raises(CacheCodecError):
+        CacheCodec().decode(cached)
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+def test_corrupt_compressed_body_is_unreadable(compression):
+    codec = CacheCodec(compression, min_bytes=1)
+    encoded = codec.encode(BODY, 1.0)
+    corrupt = encoded[:12] + bytes(b ^ 0xFF for b in encoded[12:])
+    with pytest.raises(CacheCodecError):
+        codec.decode(corrupt)
+    with pytest.raises(CacheCodecError):
+        codec.decode(encoded[: len(encoded) // 2])
+
+
+def test_corrupt_response_headers_are_unreadable():
+    codec = CacheCodec("none")
+    encoded = codec.encode(BODY, 1.0, {"x-next-cursor": "abc"})
+    # Header byte and soft expiry take 9 bytes, the headers length 2 more.
+    corrupt = encoded[:11] + b"[" + encoded[12:]
+    with pytest.raises(CacheCodecError):
+        codec.decode(corrupt)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import fakeredis.aioredis
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from starlette.requests import Request
+
+from app.core.security import _resolve_payload, _token_digest
+from app.integrations import jwt_verifier
+from app.integrations.auth_client import (
+    AuthServiceUnauthorizedError,
+    AuthServiceUnavailableError,
+    TokenIntrospectionResult,
+)
+from app.integrations.jwt_verifier import JwtVerifier, SigningKeysUnavailableError
+
+AUDIENCE = "movies-api"
+ISSUER = "https://auth.example"
+
+
+def make_key(kid: str) -> tuple[rsa.RSAPrivateKey, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk["kid"] = kid
+    return private_key, jwk
+
+
+KEY_1, JWK_1 = make_key("k1")
+KEY_2, JWK_2 = make_key("k2")
+
+
+def make_token(key=KEY_1, kid="k1", **claims) -> str:
+    payload = {
+        "sub": "user-1",
+        "aud": AUDIENCE,
+        "iss": ISSUER,
+        "exp": int(time.time()) + 300,
+        "roles": ["admin"],
+        **claims,
+    }
+    return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeAuthClient:
+    """Serves a JWKS and introspection answers, counts the calls."""
+
+    def __init__(self, keys: list[dict] | None = None) -> None:
+        self.keys = keys if keys is not None else [JWK_1]
+        self.jwks_available = True
+        self.active = True
+        self.jwks_calls = 0
+        self.introspect_calls = 0
+
+    async def fetch_jwks(self) -> dict:
+        self.jwks_calls += 1
+        if not self.jwks_available:
+            raise AuthServiceUnavailableError("Authentication service unavailable")
+        return {"keys": self.keys}
+
+    async def introspect_token(self, token: str, **kwargs) -> TokenIntrospectionResult:
+        self.introspect_calls += 1
+        return TokenIntrospectionResult(active=self.active, user_id="user-1")
+
+
+def make_verifier(auth_client: FakeAuthClient, **kwargs) -> JwtVerifier:
+    options = {
+        "algorithms": ["RS256"],
+        "audience": AUDIENCE,
+        "issuer": ISSUER,
+        "revocation_check_seconds": 0,
+        **kwargs,
+    }
+    return JwtVerifier(auth_client, **options)
+
+
+async def verify(verifier: JwtVerifier, token: str) -> TokenIntrospectionResult:
+    return await verifier.verify(token, _token_digest(token))
+
+
+@pytest.mark.asyncio
+async def test_valid_token_maps_claims():
+    verifier = make_verifier(FakeAuthClient())
+    result = await verify(
+        verifier,
+        make_token(permissions=["films:read", {"id": "p", "resource": "r", "action": "a"}]),
+    )
+
+    assert result.active and result.user_id == "user-1"
+    assert [role.name for role in result.roles] == ["admin"]
+    assert [(p.id, p.resource, p.action) for p in result.permissions] == [
+        ("films:read", "films", "read"),
+        ("p", "r", "a"),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token",
+    [
+        pytest.param(make_token(key=KEY_2), id="bad-signature"),
+        pytest.param(make_token(exp=int(time.time()) - 60), id="expired"),
+        pytest.param(make_token(aud="other-api"), id="audience"),
+        pytest.param(make_token(iss="https://evil.example"), id="issuer"),
+    ],
+)
+async def test_invalid_tokens_are_rejected(token):
+    verifier = make_verifier(FakeAuthClient())
+    with pytest.raises(AuthServiceUnauthorizedError):
+        await verify(verifier, token)
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refreshes_jwks(monkeypatch):
+    monkeypatch.setattr(jwt_verifier, "MIN_JWKS_REFRESH_INTERVAL", 0)
+    auth_client = FakeAuthClient()
+    verifier = make_verifier(auth_client)
+    await verify(verifier, make_token())
+    assert auth_client.jwks_calls == 1
+
+    # The service rotated to a new key.
+    auth_client.keys = [JWK_1, JWK_2]
+    result = await verify(verifier, make_token(key=KEY_2, kid="k2"))
+    assert result.user_id == "user-1"
+    assert auth_client.jwks_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refresh_is_rate_limited():
+    auth_client = FakeAuthClient()
+    verifier = make_verifier(auth_client)
+    await verify(verifier, make_token())
+    for _ in range(3):
+        with pytest.raises(AuthServiceUnauthorizedError):
+            await verify(verifier, make_token(key=KEY_2, kid="garbage"))
+    assert auth_client.jwks_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_jwks_outage_keeps_cached_keys(monkeypatch):
+    monkeypatch.setattr(jwt_verifier, "MIN_JWKS_REFRESH_INTERVAL", 0)
+    auth_client = FakeAuthClient()
+    verifier = make_verifier(auth_client, jwks_refresh_seconds=0)
+    await verify(verifier, make_token())
+
+    auth_client.jwks_available = False
+    assert (await verify(verifier, make_token())).user_id == "user-1"
+    assert auth_client.jwks_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_jwks_outage_falls_back_to_introspection():
+    auth_client = FakeAuthClient()
+    auth_client.jwks_available = False
+    verifier = make_verifier(auth_client)
+    token = make_token()
+    with pytest.raises(SigningKeysUnavailableError):
+        await verify(verifier, token)
+
+    redis = fakeredis.aioredis.FakeRedis()
+    request = Request({"type": "http", "headers": []})
+    payload = await _resolve_payload(request, token, auth_client, redis, verifier)
+    assert payload.active and payload.user_id == "user-1"
+    assert auth_client.introspect_calls == 1
+    await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_rejected_after_the_check():
+    auth_client = FakeAuthClient()
+    verifier = make_verifier(auth_client, revocation_check_seconds=60)
+    token = make_token()
+    await verify(verifier, token)
+
+    auth_client.active = False
+    # The first check runs in the background, its answer is honoured later.
+    await asyncio.gather(*verifier._tasks)
+    assert auth_client.introspect_calls == 1
+    with pytest.raises(AuthServiceUnauthorizedError):
+        await verify(verifier, token)
+    # Other tokens are not affected.
+    assert (await verify(verifier, make_token(sub="user-2"))).active
+    await verifier.close()
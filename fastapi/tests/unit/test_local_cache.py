@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import fakeredis.aioredis
+import pytest
+
+from app.services.cache import CacheService
+from app.services.local_cache import CacheStats, LocalCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("app.services.local_cache.time.monotonic", clock)
+    return clock
+
+
+def test_evicts_least_recently_used_by_entries():
+    cache = LocalCache(max_entries=2, max_bytes=1000, ttl=60)
+    cache.set("a", 1, size=1)
+    cache.set("b", 2, size=1)
+    assert cache.get("a") == 1
+    cache.set("c", 3, size=1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = LocalCache(max_entries=10, max_bytes=10, ttl=60)
+    cache.set("a", "a", size=4)
+    cache.set("b", "b", size=4)
+    cache.set("c", "c", size=4)
+
+    assert cache.get("a") is None
+    assert cache.info() == {"entries": 2, "bytes": 8, "max_entries": 10, "max_bytes": 10}
+
+    # An entry larger than the whole budget is not kept, nor does it evict.
+    cache.set("huge", "x", size=11)
+    assert cache.get("huge") is None
+    assert len(cache) == 2
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = LocalCache(max_entries=10, max_bytes=10, ttl=60)
+    cache.set("a", "old", size=6)
+    cache.set("a", "new", size=3)
+    assert cache.info()["bytes"] == 3
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = LocalCache(max_entries=10, max_bytes=100, ttl=10)
+    cache.set("default", 1, size=1)
+    cache.set("short", 2, size=1, ttl=2)
+
+    clock.now += 3
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+
+    clock.now += 8
+    assert cache.get("default") is None
+    assert cache.info()["bytes"] == 0
+
+
+def test_invalidate_tags_drops_tagged_entries():
+    cache = LocalCache(max_entries=10, max_bytes=100, ttl=60)
+    cache.set("films:1", 1, size=1, tags=("films", "films:1"))
+    cache.set("films:2", 2, size=1, tags=("films",))
+    cache.set("genres:1", 3, size=1, tags=("genres",))
+
+    cache.invalidate_tags(["films:1"])
+    assert cache.get("films:1") is None and cache.get("films:2") == 2
+    cache.invalidate_tags(["films"])
+    assert len(cache) == 1 and cache.get("genres:1") == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_service_counts_hits_and_misses_per_tier():
+    redis = fakeredis.aioredis.FakeRedis()
+    stats = CacheStats()
+    local = LocalCache(max_entries=10, max_bytes=10_000, ttl=60)
+    cache = CacheService(redis, ttl=60, local=local, stats=stats)
+
+    assert await cache.get("k") is None
+    assert (stats.local_misses, stats.redis_misses) == (1, 1)
+
+    await cache.set("k", {"v": 1})
+    assert await cache.get("k") == {"v": 1}
+    assert stats.local_hits == 1 and stats.redis_hits == 0
+
+    # Another worker: empty local tier, the entry comes from Redis once.
+    other_local = LocalCache(max_entries=10, max_bytes=10_000, ttl=60)
+    other = CacheService(redis, ttl=60, local=other_local)
+    assert await other.get("k") == {"v": 1}
+    assert await other.get("k") == {"v": 1}
+    assert other.stats.as_dict() == {
+        "local_hits": 1,
+        "local_misses": 1,
+        "redis_hits": 1,
+        "redis_misses": 0,
+        "stale_hits": 0,
+        "negative_hits": 0,
+    }
+    await redis.aclose()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.integrations.auth_client import AuthServiceClient, AuthServiceUnavailableError
+from app.integrations.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AdaptiveTimeout,
+    CircuitBreaker,
+)
+
+
+def test_breaker_opens_on_failure_rate_and_closes_after_probes():
+    breaker = CircuitBreaker(
+        "test", minimum_calls=4, window_size=4, open_seconds=0.05, half_open_max_calls=2
+    )
+    for _ in range(4):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_adaptive_timeout_backs_off_on_timeouts_and_recovers():
+    timeout = AdaptiveTimeout(
+        minimum=0.01, maximum=1.0, multiplier=2, window_size=10, minimum_samples=5
+    )
+    for _ in range(10):
+        timeout.observe(0.02)
+    assert timeout.current == pytest.approx(0.04)
+
+    timeout.timed_out(0.04)
+    assert timeout.current == pytest.approx(0.08)
+    timeout.timed_out(0.08)
+    assert timeout.current == pytest.approx(0.16)
+
+    for _ in range(10):
+        timeout.observe(0.02)
+    assert timeout.current == pytest.approx(0.04)
+
+
+class SlowAuthService:
+    """Answers after ``latency`` seconds, times out like httpx would."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        limit = request.extensions["timeout"]["read"]
+        await asyncio.sleep(min(self.latency, limit))
+        if self.latency > limit:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json={"active": True, "user_id": "user"})
+
+
+async def _introspect(client: AuthServiceClient) -> bool:
+    try:
+        await client.introspect_token("token", max_retries=1)
+    except AuthServiceUnavailableError:
+        return False
+    return True
+
+
+@pytest.mark.asyncio
+async def test_auth_client_follows_latency_up_and_down():
+    service = SlowAuthService(latency=0.02)
+    breaker = CircuitBreaker("auth", minimum_calls=4, window_size=4, open_seconds=0.05)
+    timeout = AdaptiveTimeout(
+        minimum=0.01, maximum=0.5, multiplier=2, window_size=10, minimum_samples=5
+    )
+    client = AuthServiceClient(
+        "http://auth",
+        introspection_path="/introspect",
+        breaker=breaker,
+        adaptive_timeout=timeout,
+    )
+    client._client = httpx.AsyncClient(
+        base_url="http://auth", transport=httpx.MockTransport(service.handler)
+    )
+    try:
+        for _ in range(10):
+            assert await _introspect(client)
+        assert timeout.current < 0.1
+
+        # The service slows down past the learnt timeout.
+        service.latency = 0.1
+        deadline = time.monotonic() + 2
+        while not await _introspect(client):
+            assert time.monotonic() < deadline, breaker.as_dict()
+            await asyncio.sleep(0.01)
+        assert breaker.state == CLOSED
+        assert timeout.current > 0.1
+
+        # And speeds up again.
+        service.latency = 0.02
+        for _ in range(10):
+            assert await _introspect(client)
+        assert timeout.current < 0.1
+    finally:
+        await client.close()
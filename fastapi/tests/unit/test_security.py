@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from starlette.requests import Request
+
+from app.core.security import _resolve_payload, _token_digest
+from app.integrations.auth_client import TokenIntrospectionResult
+from app.services.local_cache import LocalCache
+from app.services.singleflight import SingleFlight
+
+
+class CountingRedis:
+    """Fake Redis that records every command the auth path sends."""
+
+    def __init__(self) -> None:
+        self._redis = fakeredis.aioredis.FakeRedis()
+        self.commands: list[str] = []
+
+    def __getattr__(self, name: str):
+        command = getattr(self._redis, name)
+
+        async def call(*args, **kwargs):
+            self.commands.append(name)
+            return await command(*args, **kwargs)
+
+        return call
+
+
+class FakeAuthClient:
+    def __init__(self, *, expires_in: float = 3600, delay: float = 0) -> None:
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+
+    async def introspect_token(self, token: str, **kwargs) -> TokenIntrospectionResult:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return TokenIntrospectionResult(
+            active=True,
+            user_id=f"user-{token}",
+            exp=datetime.fromtimestamp(time.time() + self.expires_in, tz=timezone.utc),
+        )
+
+
+@pytest_asyncio.fixture
+async def redis():
+    client = CountingRedis()
+    try:
+        yield client
+    finally:
+        await client._redis.aclose()
+
+
+@pytest.fixture
+def request_():
+    return Request({"type": "http", "headers": []})
+
+
+@pytest.mark.asyncio
+async def test_repeated_token_is_served_without_redis(redis, request_):
+    auth_client = FakeAuthClient()
+    token_cache = LocalCache(max_entries=10, max_bytes=10, ttl=60)
+
+    first = await _resolve_payload(request_, "t", auth_client, redis, None, token_cache)
+    commands = list(redis.commands)
+    assert commands == ["get", "setex"]
+
+    second = await _resolve_payload(request_, "t", auth_client, redis, None, token_cache)
+    assert second == first
+    assert redis.commands == commands
+    assert auth_client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_token_never_outlives_its_exp(redis, request_, monkeypatch):
+    auth_client = FakeAuthClient(expires_in=2)
+    token_cache = LocalCache(max_entries=10, max_bytes=10, ttl=60)
+    await _resolve_payload(request_, "t", auth_client, redis, None, token_cache)
+    assert token_cache.get(_token_digest("t")) is not None
+
+    later = time.monotonic() + 3
+    monkeypatch.setattr("app.services.local_cache.time.monotonic", lambda: later)
+    assert token_cache.get(_token_digest("t")) is None
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_not_cached(redis, request_):
+    auth_client = FakeAuthClient(expires_in=-1)
+    token_cache = LocalCache(max_entries=10, max_bytes=10, ttl=60)
+    await _resolve_payload(request_, "t", auth_client, redis, None, token_cache)
+    assert len(token_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_token_cache_is_bounded(redis, request_):
+    auth_client = FakeAuthClient()
+    token_cache = LocalCache(max_entries=2, max_bytes=2, ttl=60)
+    for token in ("a", "b", "c"):
+        await _resolve_payload(request_, token, auth_client, redis, None, token_cache)
+
+    assert len(token_cache) == 2
+    assert token_cache.get(_token_digest("a")) is None
+    assert token_cache.get(_token_digest("c")) is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_share_one_introspection(redis, request_):
+    auth_client = FakeAuthClient(delay=0.05)
+    flight = SingleFlight()
+
+    payloads = await asyncio.gather(
+        *(
+            _resolve_payload(
+                request_,
+                "t",
+                auth_client,
+                redis,
+                None,
+                flight=flight,
+                max_retries=1 if number % 2 else None,
+            )
+            for number in range(10)
+        )
+    )
+
+    assert all(payload == payloads[0] for payload in payloads)
+    assert auth_client.calls == 1
+    assert redis.commands.count("setex") == 1
+    assert len(flight) == 0
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+
+from app.services.cache import CacheService
+from app.services.singleflight import SingleFlight, acquire_lock
+
+
+@pytest_asyncio.fixture
+async def redis():
+    client = fakeredis.aioredis.FakeRedis()
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
+class Loader:
+    def __init__(self, value, delay: float = 0.05) -> None:
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_in_one_worker_share_one_load():
+    flight = SingleFlight()
+    loader = Loader({"id": 1})
+
+    results = await asyncio.gather(*(flight.do("k", loader) for _ in range(10)))
+
+    assert results == [{"id": 1}] * 10
+    assert loader.calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_waits_for_the_lock_holder(redis):
+    holder, waiter = SingleFlight(redis), SingleFlight(redis, poll_interval=0.01)
+    cache: dict[str, str] = {}
+
+    async def fill():
+        await asyncio.sleep(0.05)
+        cache["k"] = "loaded"
+        return "loaded"
+
+    async def recheck():
+        return cache.get("k")
+
+    loader = Loader("again")
+    first = asyncio.create_task(holder.do("k", fill, recheck=recheck))
+    await asyncio.sleep(0.01)
+    assert await waiter.do("k", loader, recheck=recheck) == "loaded"
+    assert await first == "loaded"
+    assert loader.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_lock_holder_rechecks_before_loading(redis):
+    # The previous holder filled the cache between our miss and our lock.
+    flight = SingleFlight(redis)
+    loader = Loader("again")
+
+    async def recheck():
+        return "cached"
+
+    assert await flight.do("k", loader, recheck=recheck) == "cached"
+    assert loader.calls == 0
+    assert not await redis.exists("lock:k")
+
+
+@pytest.mark.asyncio
+async def test_waiter_loads_itself_when_the_lock_times_out(redis):
+    await acquire_lock(redis, "lock:k", 10)
+    flight = SingleFlight(redis, lock_timeout=0.05, poll_interval=0.01)
+    loader = Loader("loaded", delay=0)
+
+    async def recheck():
+        return None
+
+    assert await flight.do("k", loader, recheck=recheck) == "loaded"
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_entry_counts_as_a_hit_across_workers(redis):
+    workers = [
+        CacheService(redis, ttl=60, flight=SingleFlight(redis, poll_interval=0.01))
+        for _ in range(2)
+    ]
+    loader = Loader(None)
+
+    results = await asyncio.gather(
+        *(
+            worker.get_or_set("films:detail:missing", loader, negative_ttl=30)
+            for worker in workers
+        )
+    )
+
+    assert results == [None, None]
+    assert loader.calls == 1
+    assert workers[1].stats.negative_hits + workers[0].stats.negative_hits == 1